@@ -0,0 +1,156 @@
+import os
+import time
+import pygame
+
+RESOURCES_PATH = os.path.join(os.path.dirname(__file__), "resources")
+
+
+# -------------------------
+# Fallbacks if an image file is missing/broken
+# -------------------------
+def _fallback_enemy():
+    surface = pygame.Surface((40, 40), pygame.SRCALPHA)
+    surface.fill((255, 0, 255))  # Magenta fallback
+    return surface
+
+
+def _fallback_tower():
+    surface = pygame.Surface((80, 80), pygame.SRCALPHA)
+    surface.fill((128, 128, 128))
+    return surface
+
+
+def _fallback_bullet():
+    surface = pygame.Surface((16, 16), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (255, 255, 0), (8, 8), 8)
+    return surface
+
+
+# Rotated frames per sprite (one every 360 / ROTATION_STEPS degrees)
+ROTATION_STEPS = 64
+
+# sprite name -> (file in resources/, scaled width (aspect ratio kept), fallback)
+SPRITES = {
+    "enemy_1": ("Enemy_Cone Idle_01.png", 70, _fallback_enemy),     # Green enemy
+    "enemy_2": ("Enemy_Yellow_Idle01.png", 70, _fallback_enemy),    # Yellow enemy
+    "enemy_3": ("Trooper01_Idle01.png", 70, _fallback_enemy),       # Red enemy
+    "tower_Bazooka": ("BazookaEnergyx2_01.png", 80, _fallback_tower),
+    "tower_Sniper": ("Sniper 01.png", 80, _fallback_tower),
+    "tower_Shotgun": ("Shotgun Idle.png", 80, _fallback_tower),
+    "bullet": ("Bullet_Rainbow1_PuftDank02.png", 24, _fallback_bullet),
+}
+
+
+class AssetCache:
+    """Loads, scales and shares every sprite exactly once.
+
+    All entities of a type draw the same Surface, so spawning enemies or
+    firing bullets never reads or decodes an image. Needs a display mode to be
+    set before the first load (convert_alpha).
+    """
+
+    def __init__(self, sprite_table=SPRITES, rotation_steps=ROTATION_STEPS):
+        self.sprite_table = sprite_table
+        self.rotation_steps = rotation_steps
+        self.sprites = {}      # name -> scaled Surface
+        self.rotations = {}    # name -> [rotated Surface or None] * rotation_steps
+        self.load_times = {}   # name -> seconds spent loading + scaling
+        self.hits = 0
+        self.misses = 0
+        self.rotation_hits = 0
+        self.rotation_misses = 0
+
+    def _load(self, name):
+        filename, desired_width, fallback = self.sprite_table[name]
+        img_path = os.path.join(RESOURCES_PATH, filename)
+
+        start = time.perf_counter()
+        try:
+            raw_image = pygame.image.load(img_path).convert_alpha()
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Could not load image {img_path}: {e}")
+            raw_image = fallback()
+
+        # Scale to the desired width, keep aspect ratio
+        orig_w, orig_h = raw_image.get_size()
+        new_height = int(orig_h * desired_width / orig_w)
+        surface = pygame.transform.smoothscale(raw_image, (desired_width, new_height))
+
+        self.load_times[name] = time.perf_counter() - start
+        return surface
+
+    def sprite(self, name):
+        surface = self.sprites.get(name)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._load(name)
+        self.sprites[name] = surface
+        return surface
+
+    def rotated(self, name, angle):
+        """`name` rotated by `angle` degrees (CCW, like pygame.transform.rotate).
+
+        The angle is snapped to the nearest of `rotation_steps` frames; each
+        frame is rotated once and then reused, so drawing is a table lookup.
+        """
+        frames = self.rotations.get(name)
+        if frames is None:
+            frames = [None] * self.rotation_steps
+            self.rotations[name] = frames
+
+        step = round(angle * self.rotation_steps / 360.0) % self.rotation_steps
+        surface = frames[step]
+        if surface is not None:
+            self.rotation_hits += 1
+            return surface
+
+        self.rotation_misses += 1
+        surface = pygame.transform.rotate(self.sprite(name), step * 360.0 / self.rotation_steps)
+        frames[step] = surface
+        return surface
+
+    def preload(self, names=None, rotations=False):
+        """Load every sprite (or just `names`) up front. Returns total seconds spent.
+
+        With `rotations=True` all rotated frames are built too, instead of
+        lazily on first use.
+        """
+        if names is None:
+            names = self.sprite_table.keys()
+
+        start = time.perf_counter()
+        for name in names:
+            if name not in self.sprites:
+                self.misses += 1
+                self.sprites[name] = self._load(name)
+            if rotations:
+                for step in range(self.rotation_steps):
+                    self.rotated(name, step * 360.0 / self.rotation_steps)
+        return time.perf_counter() - start
+
+    def clear(self):
+        self.sprites.clear()
+        self.rotations.clear()
+        self.load_times.clear()
+        self.hits = 0
+        self.misses = 0
+        self.rotation_hits = 0
+        self.rotation_misses = 0
+
+    def stats(self):
+        return {
+            "loaded": len(self.sprites),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rotation_hits": self.rotation_hits,
+            "rotation_misses": self.rotation_misses,
+            "load_time_ms": round(sum(self.load_times.values()) * 1000, 2),
+            "load_times_ms": {n: round(t * 1000, 2) for n, t in self.load_times.items()},
+        }
+
+
+# Shared instance used by all entities
+assets = AssetCache()
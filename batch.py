@@ -0,0 +1,192 @@
+"""Batch simulator for balance and regression sweeps.
+
+Runs every (tower layout x stat table x seed) combination as its own headless
+game, spread over all CPU cores with a multiprocessing.Pool, and prints one
+aggregated JSON report (win rate, waves reached, leaks, score and per-frame
+cost per layout/stat table pair).
+
+    python3 batch.py                          # built-in example sweep
+    python3 batch.py sweep.json --processes 8 --out report.json
+
+A sweep file looks like DEFAULT_SWEEP below. Layouts use the replay input
+format ({"frame", "action", ...}, see replay.py), so the inputs of a recorded
+game can be re-run against other stat tables. Stat tables are partial
+overrides of the enemy/tower stats (see simulation.stat_tables).
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout pure JSON
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import deque
+from multiprocessing import Pool
+
+from simulation import Simulation, START_HEALTH
+from replay import apply_input
+
+
+def _place(frame, tower, x, y):
+    return {"frame": frame, "action": "place", "tower": tower, "tile": [x, y]}
+
+
+DEFAULT_SWEEP = {
+    "waves": 5,
+    "seeds": 16,
+    "max_frames": 60 * 60 * 10,
+    "layouts": {
+        "bazookas": [_place(0, "Bazooka", x, y) for x, y in ((6, 4), (12, 12), (18, 4), (24, 12))],
+        "snipers": [_place(f, "Sniper", x, y)
+                    for f, (x, y) in zip((0, 0, 900, 1800), ((8, 8), (20, 8), (14, 3), (14, 13)))],
+    },
+    "stat_tables": {
+        "default": {},
+        "tough_enemies": {"wave_scaling": {"hp": 0.15}},
+        "strong_snipers": {"towers": {"Sniper": {"damage": 35}}},
+    },
+}
+
+
+# ------------------- ONE RUN (worker process) -------------------
+def run_one(spec):
+    """Play one seeded game with `spec`'s layout and stats. Returns its result row."""
+    sim = Simulation(max_waves=spec["waves"], seed=spec["seed"], stats=spec["stats"],
+                     vectorized=spec.get("vectorized", False))
+    pending = deque(sorted(spec["layout"], key=lambda event: event["frame"]))
+    max_frames = spec["max_frames"]
+
+    start = time.perf_counter()
+    while not sim.finished and sim.frame < max_frames:
+        while pending and pending[0]["frame"] <= sim.frame:
+            apply_input(sim, pending.popleft())
+        sim.step()
+    seconds = time.perf_counter() - start
+    sim.close()
+
+    return {
+        "layout": spec["layout_name"],
+        "stats": spec["stats_name"],
+        "seed": spec["seed"],
+        "victory": sim.victory,
+        "wave": sim.wave,
+        "leaks": START_HEALTH - sim.health,
+        "score": sim.score,
+        "towers": len(sim.towers),
+        "frames": sim.frame,
+        "ms_per_frame": seconds * 1000 / sim.frame if sim.frame else 0.0,
+        "seconds": seconds,
+    }
+
+
+# ------------------- SWEEP -------------------
+def make_specs(sweep):
+    """One spec per (layout, stat table, seed)."""
+    seeds = sweep["seeds"]
+    if isinstance(seeds, int):
+        seeds = range(seeds)
+
+    specs = []
+    for layout_name, layout in sweep["layouts"].items():
+        for stats_name, stats in sweep["stat_tables"].items():
+            for seed in seeds:
+                specs.append({
+                    "layout_name": layout_name,
+                    "layout": layout,
+                    "stats_name": stats_name,
+                    "stats": stats or None,
+                    "seed": seed,
+                    "waves": sweep["waves"],
+                    "max_frames": sweep["max_frames"],
+                    "vectorized": sweep.get("vectorized", False),
+                })
+    return specs
+
+
+def aggregate(rows):
+    """Per (layout, stat table) summary of the result rows."""
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["layout"], row["stats"]), []).append(row)
+
+    summary = []
+    for (layout, stats), group in sorted(groups.items()):
+        scores = [r["score"] for r in group]
+        summary.append({
+            "layout": layout,
+            "stats": stats,
+            "runs": len(group),
+            "win_rate": round(sum(r["victory"] for r in group) / len(group), 3),
+            "mean_wave": round(statistics.mean(r["wave"] for r in group), 2),
+            "mean_leaks": round(statistics.mean(r["leaks"] for r in group), 2),
+            "score": {"mean": round(statistics.mean(scores), 1), "min": min(scores), "max": max(scores)},
+            "mean_frames": round(statistics.mean(r["frames"] for r in group)),
+            "ms_per_frame": {
+                "mean": round(statistics.mean(r["ms_per_frame"] for r in group), 4),
+                "max": round(max(r["ms_per_frame"] for r in group), 4),
+            },
+        })
+    return summary
+
+
+def run_batch(sweep, processes=None):
+    """Run the whole sweep on a process pool. Returns the aggregated report."""
+    specs = make_specs(sweep)
+    processes = processes or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    if processes == 1:
+        rows = [run_one(spec) for spec in specs]
+    else:
+        with Pool(processes) as pool:
+            rows = list(pool.imap_unordered(run_one, specs, chunksize=1))
+    wall = time.perf_counter() - start
+
+    # worker seconds / wall seconds: ~processes when the work spreads evenly
+    busy = sum(r["seconds"] for r in rows)
+    return {
+        "runs": len(rows),
+        "processes": processes,
+        "wall_seconds": round(wall, 3),
+        "runs_per_second": round(len(rows) / wall, 2) if wall else None,
+        "parallel_speedup": round(busy / wall, 2) if wall else None,
+        "summary": aggregate(rows),
+        "results": sorted(
+            ({k: v for k, v in r.items() if k != "seconds"} for r in rows),
+            key=lambda r: (r["layout"], r["stats"], r["seed"]),
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many seeded games in parallel (JSON report)")
+    parser.add_argument("sweep", nargs="?", help="sweep JSON file (default: built-in example)")
+    parser.add_argument("--processes", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--seeds", type=int, help="override the number of seeds per combination")
+    parser.add_argument("--summary-only", action="store_true", help="leave out per-run rows")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    sweep = dict(DEFAULT_SWEEP)
+    if args.sweep:
+        with open(args.sweep) as f:
+            sweep.update(json.load(f))
+    if args.seeds is not None:
+        sweep["seeds"] = args.seeds
+
+    report = run_batch(sweep, args.processes)
+    if args.summary_only:
+        del report["results"]
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Micro-benchmarks: structures.Queue/Stack vs RingQueue/UndoStack.
+
+Run from the project folder:  python3 -m benchmarks.bench_structures
+"""
+import json
+import random
+import timeit
+
+from structures import Queue, Stack, RingQueue, UndoStack
+
+
+def _queue_fill_drain(make, n):
+    def run():
+        q = make()
+        for i in range(n):
+            q.enqueue(i)
+        while not q.is_empty():
+            q.dequeue()
+    return run
+
+
+def _stack_sell(make_push, remove, n, seed):
+    """Push n towers, then sell (remove) a random half of them, then undo the rest."""
+    order = list(range(n))
+    random.Random(seed).shuffle(order)
+    sold = order[: n // 2]
+
+    def run():
+        stack, handles = make_push(n)
+        for i in sold:
+            remove(stack, handles, i)
+        while stack.pop() is not None:
+            pass
+    return run
+
+
+def _list_stack(n):
+    s = Stack()
+    for i in range(n):
+        s.push(i)
+    return s, None
+
+
+def _list_stack_remove(stack, handles, i):
+    stack.items.remove(i)  # what main.py used to do when selling
+
+
+def _undo_stack(n):
+    s = UndoStack()
+    return s, [s.push(i) for i in range(n)]
+
+
+def _undo_stack_remove(stack, handles, i):
+    stack.invalidate(handles[i])
+
+
+def time_call(fn, repeat=5):
+    """Best of `repeat` runs, in milliseconds."""
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def run(sizes=(100, 1_000, 10_000), seed=0):
+    results = []
+    for n in sizes:
+        results.append({
+            "n": n,
+            "queue_ms": round(time_call(_queue_fill_drain(Queue, n)), 3),
+            "ring_queue_ms": round(time_call(_queue_fill_drain(lambda: RingQueue(n), n)), 3),
+            "stack_sell_ms": round(time_call(_stack_sell(_list_stack, _list_stack_remove, n, seed)), 3),
+            "undo_stack_sell_ms": round(time_call(_stack_sell(_undo_stack, _undo_stack_remove, n, seed)), 3),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
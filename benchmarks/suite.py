@@ -0,0 +1,353 @@
+"""Reproducible benchmark suite for the algorithm and simulation hot paths.
+
+Every case builds its input from a seeded random.Random (and seeds the
+global `random` module for code that still uses it), so two runs with the
+same --seed time exactly the same work. Results are printed as JSON.
+
+Run from the project folder:
+
+    python3 -m benchmarks.suite                  # full sweep
+    python3 -m benchmarks.suite --quick          # small sizes only
+    python3 -m benchmarks.suite --only graph --out graph.json
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout pure JSON
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from algorithms import quick_sort, binary_search_max_affordable_index, insertion_sort_desc
+from graph import GridGraph, build_grid_graph, generate_path, path_to_pixels, build_path
+from map import TILE_SIZE
+from enemy import create_enemy, release_enemy, ENEMY_STATS
+from bullet import create_bullet, release_bullet
+from tower import create_tower
+from spatial import SpatialHash
+from coverage import coverage_intervals
+from enemy_index import ProgressIndex
+from scheduler import FireScheduler
+from simulation import Simulation
+from benchmarks import bench_structures
+
+TOWER_TYPES = ("Bazooka", "Sniper", "Shotgun")
+FRAMES = 60  # entity benchmarks time one second of game time
+
+SWEEPS = {
+    "full": {
+        "grid_sizes": [(30, 17), (60, 34), (120, 68)],
+        "algo_sizes": [100, 1_000, 5_000],
+        "enemy_counts": [100, 1_000, 5_000],
+        "tower_counts": [10, 50, 200],
+        "densities": [0.0, 0.1, 0.25],
+        "sim_frames": 3_000,
+    },
+    "quick": {
+        "grid_sizes": [(30, 17), (60, 34)],
+        "algo_sizes": [100, 1_000],
+        "enemy_counts": [100, 1_000],
+        "tower_counts": [10, 50],
+        "densities": [0.0, 0.1],
+        "sim_frames": 600,
+    },
+}
+
+
+# ------------------- TIMING -------------------
+def measure(setup, repeat):
+    """Time `setup()`'s returned callable `repeat` times, each on fresh input.
+
+    Setup is not timed. Returns best and median milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        fn = setup()
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"best_ms": round(min(times), 4), "median_ms": round(statistics.median(times), 4)}
+
+
+def _random_blocked(rng, width, height, density):
+    """`density` of the inner tiles, chosen at random (stand-ins for towers)."""
+    tiles = [(x, y) for x in range(width) for y in range(1, height - 1)]
+    return set(rng.sample(tiles, int(len(tiles) * density)))
+
+
+def _level_path(seed, width=30, height=17):
+    """Seeded enemy path on an empty width x height map."""
+    tiles = generate_path(GridGraph(width, height), random.Random(seed))
+    return tiles, build_path(tiles, TILE_SIZE)
+
+
+# ------------------- GRAPH -------------------
+def bench_graph(sweep, seed, repeat):
+    results = []
+    for width, height in sweep["grid_sizes"]:
+        for density in sweep["densities"]:
+            params = {"width": width, "height": height, "density": density}
+            blocked = _random_blocked(random.Random(seed), width, height, density)
+            # both BFS variants search the same open start/goal pair
+            start, goal = (0, height // 2), (width - 1, height // 2)
+            blocked -= {start, goal}
+
+            def build():
+                random.seed(seed)  # build_grid_graph shuffles with the global RNG
+                return lambda: build_grid_graph(blocked, width, height)
+            results.append(("graph.build_grid_graph", params, measure(build, repeat)))
+
+            random.seed(seed)
+            adj_graph = build_grid_graph(blocked, width, height)
+            grid = GridGraph(width, height)
+            for tile in blocked:
+                grid.block(tile)
+
+            # tiles on the path found (0: none), so the two timings can be compared
+            found = len(grid.bfs_path(start, goal) or ())
+            results.append(("graph.bfs_path", dict(params, graph="adjacency", path_tiles=found),
+                            measure(lambda: lambda: adj_graph.bfs_path(start, goal), repeat)))
+            results.append(("graph.bfs_path", dict(params, graph="grid", path_tiles=found),
+                            measure(lambda: lambda: grid.bfs_path(start, goal), repeat)))
+
+            def gen():
+                rng = random.Random(seed)
+                return lambda: generate_path(grid, rng)
+            results.append(("graph.generate_path", params, measure(gen, repeat)))
+
+        tiles = generate_path(GridGraph(width, height), random.Random(seed))
+        params = {"width": width, "height": height, "tiles": len(tiles)}
+        results.append(("graph.path_to_pixels", params,
+                        measure(lambda: lambda: path_to_pixels(tiles, TILE_SIZE), repeat)))
+        results.append(("graph.build_path", params,
+                        measure(lambda: lambda: build_path(tiles, TILE_SIZE), repeat)))
+    return results
+
+
+# ------------------- ALGORITHMS -------------------
+def bench_algorithms(sweep, seed, repeat):
+    results = []
+    for n in sweep["algo_sizes"]:
+        rng = random.Random(seed)
+        items = [SimpleNamespace(cost=rng.randint(10, 500)) for _ in range(n)]
+        values = [rng.randint(0, 10_000) for _ in range(n)]
+        budgets = [rng.randint(0, 520) for _ in range(n)]
+        ordered = quick_sort(items)
+
+        def lookups():
+            for budget in budgets:
+                binary_search_max_affordable_index(ordered, budget)
+
+        results.append(("algorithms.quick_sort", {"n": n},
+                        measure(lambda: lambda: quick_sort(items), repeat)))
+        results.append(("algorithms.binary_search_max_affordable_index", {"n": n, "lookups": n},
+                        measure(lambda: lookups, repeat)))
+        results.append(("algorithms.insertion_sort_desc", {"n": n},
+                        measure(lambda: lambda: insertion_sort_desc(values), repeat)))
+    return results
+
+
+# ------------------- ENTITIES -------------------
+def _spread_enemies(path, count, rng):
+    """`count` enemies placed at random points along the first half of `path`."""
+    enemies = []
+    for _ in range(count):
+        enemy = create_enemy(rng.randint(1, 3), path)
+        enemy.distance = rng.uniform(0, path.length / 2)
+        enemy.x, enemy.y = enemy.path.position_at(enemy.distance)
+        enemy.segment = 0
+        enemies.append(enemy)
+    return enemies
+
+
+def _release_all(enemies, bullets=()):
+    for enemy in enemies:
+        release_enemy(enemy)
+    for bullet in bullets:
+        release_bullet(bullet)
+
+
+def _random_towers(rng, count, width=30, height=17):
+    towers = []
+    for _ in range(count):
+        tile = (rng.randrange(width), rng.randrange(1, height - 1))
+        towers.append(create_tower(rng.choice(TOWER_TYPES),
+                                   tile[0] * TILE_SIZE + TILE_SIZE // 2,
+                                   tile[1] * TILE_SIZE + TILE_SIZE // 2, tile))
+    return towers
+
+
+def bench_entities(sweep, seed, repeat):
+    results = []
+    _, path = _level_path(seed)
+    live = []  # entities from the previous repeat, handed back to the pools
+
+    def fresh(make):
+        def setup():
+            for group in live:
+                _release_all(*group)
+            live.clear()
+            return make()
+        return setup
+
+    for n in sweep["enemy_counts"]:
+        def move_setup():
+            enemies = _spread_enemies(path, n, random.Random(seed))
+            live.append((enemies,))
+
+            def run():
+                for _ in range(FRAMES):
+                    for enemy in enemies:
+                        enemy.move()
+            return run
+        results.append(("enemy.move", {"enemies": n, "frames": FRAMES},
+                        measure(fresh(move_setup), repeat)))
+
+        for t in sweep["tower_counts"]:
+            # what Simulation runs: FireScheduler + coverage intervals + ProgressIndex
+            def fire_setup():
+                rng = random.Random(seed)
+                enemies = _spread_enemies(path, n, rng)
+                towers = _random_towers(rng, t)
+                bullets = []
+                index = ProgressIndex(enemies)
+                scheduler = FireScheduler()
+                for tower in towers:
+                    tower.coverage = coverage_intervals(path, tower.x, tower.y, tower.range)
+                    scheduler.add(tower, 0)
+                max_speed = max(stats["speed"] for stats in ENEMY_STATS.values())
+                live.append((enemies, bullets))
+
+                def run():
+                    for frame in range(1, FRAMES + 1):
+                        index.invalidate()
+                        scheduler.step(frame, index, bullets, False, max_speed)
+                return run
+            results.append(("tower.fire_scheduled", {"enemies": n, "towers": t, "frames": FRAMES},
+                            measure(fresh(fire_setup), repeat)))
+
+            # legacy per-frame Tower.shoot scan (list or SpatialHash); the game
+            # no longer runs it, kept as the baseline for the case above
+            for use_grid in (False, True):
+                def shoot_setup():
+                    rng = random.Random(seed)
+                    enemies = _spread_enemies(path, n, rng)
+                    towers = _random_towers(rng, t)
+                    bullets = []
+                    grid = SpatialHash(TILE_SIZE) if use_grid else None
+                    live.append((enemies, bullets))
+
+                    def run():
+                        for _ in range(FRAMES):
+                            if grid is not None:
+                                grid.invalidate(enemies)
+                            for tower in towers:
+                                tower.shoot(enemies, bullets, grid)
+                    return run
+                results.append(("tower.shoot_legacy",
+                                {"enemies": n, "towers": t, "frames": FRAMES, "spatial_hash": use_grid},
+                                measure(fresh(shoot_setup), repeat)))
+
+        def bullet_setup():
+            rng = random.Random(seed)
+            enemies = _spread_enemies(path, n, rng)
+            bullets = []
+            for enemy in enemies:
+                bullet = create_bullet(enemy.x + rng.uniform(-200, 200),
+                                       enemy.y + rng.uniform(-200, 200), enemy, 0)
+                bullets.append(bullet)
+            live.append((enemies, bullets))
+
+            def run():
+                for _ in range(FRAMES):
+                    for bullet in bullets:
+                        if bullet.alive:
+                            bullet.move()
+            return run
+        results.append(("bullet.move", {"bullets": n, "frames": FRAMES},
+                        measure(fresh(bullet_setup), repeat)))
+
+    for group in live:
+        _release_all(*group)
+    return results
+
+
+# ------------------- WHOLE GAME -------------------
+def bench_simulation(sweep, seed, repeat):
+    results = []
+    frames = sweep["sim_frames"]
+    for t in sweep["tower_counts"]:
+        def setup():
+            sim = Simulation(seed=seed)
+            sim.coins = 10 ** 9
+            rng = random.Random(seed)
+            tiles = [(x, y) for x in range(30) for y in range(1, 16)]
+            for tile in rng.sample(tiles, len(tiles)):
+                if len(sim.towers) >= t:
+                    break
+                sim.place_tower(rng.choice(TOWER_TYPES), tile)
+            return lambda: sim.run(frames)
+        results.append(("simulation.step", {"towers": t, "frames": frames},
+                        measure(setup, repeat)))
+    return results
+
+
+GROUPS = {
+    "graph": bench_graph,
+    "algorithms": bench_algorithms,
+    "entities": bench_entities,
+    "simulation": bench_simulation,
+}
+
+
+def run(seed=0, quick=False, repeat=5, only=None):
+    """Run the suite. Returns a JSON-serializable dict."""
+    sweep = SWEEPS["quick" if quick else "full"]
+    results = []
+    for group, bench in GROUPS.items():
+        if only and only not in group:
+            continue
+        for name, params, timing in bench(sweep, seed, repeat):
+            results.append(dict({"benchmark": name, "params": params}, **timing))
+
+    report = {
+        "meta": {
+            "seed": seed,
+            "sweep": "quick" if quick else "full",
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if not only or only in "structures":
+        sizes = sweep["algo_sizes"]
+        report["structures"] = bench_structures.run(sizes=sizes, seed=seed)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tower defense benchmark suite (JSON output)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="small sweep (a few seconds)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (best and median reported)")
+    parser.add_argument("--only", help="only groups whose name contains this "
+                                       "(graph, algorithms, entities, simulation, structures)")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(seed=args.seed, quick=args.quick, repeat=args.repeat, only=args.only)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import pygame
 from dataclasses import dataclass
 
 from algorithms import quick_sort, binary_search_max_affordable_index
+from tower import TOWER_STATS
 
 
 @dataclass(frozen=True)
@@ -23,9 +24,8 @@ class BuildMenu:
 
         # Intentionally NOT in cost order (sorting is done algorithmically).
         unsorted_options = [
-            TowerOption("Sniper", 100),
-            TowerOption("Shotgun", 150),
-            TowerOption("Bazooka", 50),
+            TowerOption(name, TOWER_STATS[name]["cost"])
+            for name in ("Sniper", "Shotgun", "Bazooka")
         ]
 
         # Sort by cost using our custom quick sort (ascending).
@@ -58,3 +58,6 @@ class BuildMenu:
             opt = self.options[i]
             text = font.render(f"{opt.name} (${opt.cost})", True, fg)
             screen.blit(text, (rect.x + 5, rect.y + 5))
+
+        # Area touched on screen (for dirty-rect updates)
+        return self.rects[0].unionall(self.rects[1:])
@@ -1,39 +1,30 @@
-import pygame
 import math
-import os
-
-RESOURCES_PATH = os.path.join(os.path.dirname(__file__), "resources")
+from assets import assets
+from pool import ObjectPool
 
 class Bullet:
+    __slots__ = ("x", "y", "target", "target_generation", "damage", "speed",
+                 "alive", "angle", "pooled", "entity_index")
+
     def __init__(self, x, y, target, damage):
+        self.pooled = False
+        self.reset(x, y, target, damage)
+
+    def reset(self, x, y, target, damage):
+        """(Re)initialise for a new shot; used by __init__ and by the bullet pool."""
         self.x = x
         self.y = y
         self.target = target
+        # pooled enemies get reused: remember which life of the enemy we aim at
+        self.target_generation = target.generation
         self.damage = damage
         self.speed = 8  
         self.alive = True
 
-        image_path = os.path.join(RESOURCES_PATH, "Bullet_Rainbow1_PuftDank02.png")
-        
-        try:
-            self.original_image = pygame.image.load(image_path).convert_alpha()
-        except pygame.error as e:
-            print(f"Could not load bullet image: {e}")
-            self.original_image = pygame.Surface((16, 16), pygame.SRCALPHA)
-            pygame.draw.circle(self.original_image, (255, 255, 0), (8, 8), 8)
-
-        desired_width = 24
-        aspect_ratio = self.original_image.get_height() / self.original_image.get_width()
-        new_height = int(desired_width * aspect_ratio)
-        self.original_image = pygame.transform.smoothscale(self.original_image, (desired_width, new_height))
-
-        self.image = self.original_image 
-        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
-
         self.angle = 0
 
     def move(self):
-        if not self.target.alive:
+        if not self.target.alive or self.target.generation != self.target_generation:
             self.alive = False
             return 0
 
@@ -50,12 +41,22 @@ class Bullet:
 
         self.angle = math.degrees(math.atan2(dy, dx))
 
-        self.image = pygame.transform.rotate(self.original_image, -self.angle)  # - because pygame rotates CCW
-        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
-
         return 0
 
     def draw(self, screen):
-        screen.blit(self.image, self.rect.topleft)
+        image = assets.rotated("bullet", -self.angle)  # - because pygame rotates CCW
+        rect = image.get_rect(center=(int(self.x), int(self.y)))
+        return screen.blit(image, rect.topleft)
+
+
+# Bullets are recycled instead of allocated per shot
+bullet_pool = ObjectPool(Bullet)
+
+
+def create_bullet(x, y, target, damage):
+    return bullet_pool.acquire(x, y, target, damage)
+
 
-  
\ No newline at end of file
+def release_bullet(bullet):
+    """Give a finished bullet back to the pool (it must not be used afterwards)."""
+    bullet_pool.release(bullet)
@@ -0,0 +1,75 @@
+import math
+from bisect import bisect_left, bisect_right
+
+# Intervals are widened by this much (pixels) on both sides, so rounding in
+# the distance enemies add up every frame never loses a boundary hit
+COVERAGE_EPSILON = 1e-6
+
+
+def coverage_intervals(path, x, y, radius):
+    """Distances along `path` (a graph.Path) that lie within `radius` of (x, y).
+
+    Enemies only ever stand on the path, so "enemy in range" is the same as
+    "enemy.distance inside one of these intervals". Returns a sorted list of
+    disjoint (start, end) pairs, empty if the circle misses the path.
+    """
+    intervals = []
+    points, distances = path.points, path.distances
+    r2 = radius * radius
+    for i in range(len(points) - 1):
+        (x1, y1), (x2, y2) = points[i], points[i + 1]
+        length = distances[i + 1] - distances[i]
+        if length <= 0:
+            continue
+
+        # point at t pixels into the segment: P1 + u * t, |P - C|^2 <= r^2
+        ux, uy = (x2 - x1) / length, (y2 - y1) / length
+        px, py = x1 - x, y1 - y
+        b = ux * px + uy * py
+        c = px * px + py * py - r2
+        disc = b * b - c
+        if disc < 0:
+            continue
+
+        root = math.sqrt(disc)
+        t1, t2 = max(0.0, -b - root), min(length, -b + root)
+        if t1 > t2:
+            continue  # misses the segment
+
+        start = distances[i] + t1 - COVERAGE_EPSILON
+        end = distances[i] + t2 + COVERAGE_EPSILON
+        if intervals and start <= intervals[-1][1]:
+            intervals[-1] = (intervals[-1][0], max(end, intervals[-1][1]))  # runs on past a corner
+        else:
+            intervals.append((start, end))
+    return intervals
+
+
+class CoverageIndex:
+    """Answers "which towers can hit an enemy at path distance d?" in O(log n).
+
+    The interval end points of all towers split the path into pieces that
+    are each covered by a fixed set of towers; a lookup is one bisect.
+    """
+
+    def __init__(self, towers):
+        bounds = sorted({d for tower in towers for interval in tower.coverage for d in interval})
+        self.bounds = bounds
+        # pieces[i]: towers covering all of bounds[i]..bounds[i + 1]
+        self.pieces = [[] for _ in bounds]
+        for tower in towers:
+            for start, end in tower.coverage:
+                i = bisect_left(bounds, start)
+                while bounds[i] < end:
+                    self.pieces[i].append(tower)
+                    i += 1
+
+    def towers_at(self, distance):
+        i = bisect_right(self.bounds, distance) - 1
+        if i < 0:
+            return []
+        found = list(self.pieces[i])
+        if i > 0 and self.bounds[i] == distance:
+            # exactly on a bound: towers whose interval ends here count too
+            found.extend(t for t in self.pieces[i - 1] if t not in found)
+        return found
@@ -1,36 +1,53 @@
 import pygame
+from assets import assets
+from pool import ObjectPool
+
+# -------------------------
+# Enemy stats by type (balance runs pass modified copies, see batch.py)
+# -------------------------
+ENEMY_STATS = {
+    1: {"max_hp": 25, "speed": 1.2, "reward": 10},   # Green enemy
+    2: {"max_hp": 45, "speed": 0.9, "reward": 15},   # Yellow enemy
+    3: {"max_hp": 70, "speed": 0.7, "reward": 25},   # Red enemy
+}
+
+# Growth per wave after the first
+WAVE_SCALING = {"hp": 0.08, "speed": 0.02}
+
 
 class Enemy:
-    def __init__(self, enemy_type, path, wave=1):
+    __slots__ = ("type", "path", "distance", "segment", "x", "y",
+                 "max_hp", "speed", "reward", "health", "alive", "reached_end",
+                 "sprite_name", "generation", "pooled", "entity_index")
+
+    def __init__(self, enemy_type, path, wave=1, stats=None, scaling=None):
+        self.generation = 0
+        self.pooled = False
+        self.reset(enemy_type, path, wave, stats, scaling)
+
+    def reset(self, enemy_type, path, wave=1, stats=None, scaling=None):
+        """(Re)initialise for a new life; used by __init__ and by the enemy pool."""
+        # bumped on every reuse, so bullets aimed at the old enemy can tell
+        self.generation += 1
+
         self.type = enemy_type
-        self.path = path
-        self.index = 0
-        self.x, self.y = self.path[0]
+        self.path = path          # graph.Path (corner points + cumulative distances)
+        self.distance = 0.0       # pixels travelled along the path
+        self.segment = 0          # path segment we are on (walk hint)
+        self.x, self.y = self.path.start
 
         # Enemy stats
-        if enemy_type == 1:
-            self.max_hp = 25
-            self.speed = 1.2
-            image_path = "resources/Enemy_Cone Idle_01.png"  # Green enemy
-            self.reward = 10
-        elif enemy_type == 2:
-            self.max_hp = 45
-            self.speed = 0.9
-            image_path = "resources/Enemy_Yellow_Idle01.png"  # Yellow enemy
-            self.reward = 15
-        elif enemy_type == 3:
-            self.max_hp = 70
-            self.speed = 0.7
-            image_path = "resources/Trooper01_Idle01.png"    # Red enemy
-            self.reward = 25
-        else:
+        base = (stats or ENEMY_STATS).get(enemy_type)
+        if base is None:
             raise ValueError("Invalid enemy type")
-
-        self.health = self.max_hp
+        self.max_hp = base["max_hp"]
+        self.speed = base["speed"]
+        self.reward = base["reward"]
 
         # Smooth wave scaling (logical and controlled)
-        hp_multiplier = 1.0 + 0.08 * (wave - 1)  # +10% HP per wave
-        speed_multiplier = 1.0 + 0.02 * (wave - 1)  # +3% speed per wave
+        scaling = scaling or WAVE_SCALING
+        hp_multiplier = 1.0 + scaling["hp"] * (wave - 1)  # +8% HP per wave
+        speed_multiplier = 1.0 + scaling["speed"] * (wave - 1)  # +2% speed per wave
 
         self.max_hp = int(self.max_hp * hp_multiplier)
         self.health = self.max_hp
@@ -39,53 +56,18 @@ class Enemy:
         self.alive = True
         self.reached_end = False
 
-
-        # Load and prepare image (preserve aspect ratio)
-        try:
-            original_image = pygame.image.load(image_path).convert_alpha()
-        except pygame.error:
-            print(f"Could not load image: {image_path}")
-            original_image = pygame.Surface((40, 40), pygame.SRCALPHA)
-            original_image.fill((255, 0, 255))  # Magenta fallback
-
-        # Scale image to desired size while preserving aspect ratio
-        desired_width = 70  # Adjust this size as needed for your game
-        scale_factor = desired_width / original_image.get_width()
-        new_height = int(original_image.get_height() * scale_factor)
-        self.image = pygame.transform.smoothscale(original_image, (desired_width, new_height))
-
-        # Store image dimensions for centering
-        self.width = self.image.get_width()
-        self.height = self.image.get_height()
+        # Sprite is shared through the asset cache and fetched on draw,
+        # so headless simulation never touches assets
+        self.sprite_name = f"enemy_{enemy_type}"
 
     def move(self):
-        if self.index >= len(self.path) - 1:
+        if self.distance >= self.path.length:
             self.reached_end = True
             self.alive = False
             return
 
-        move_left = self.speed
-
-        while move_left > 0 and self.index < len(self.path) - 1:
-            target_x, target_y = self.path[self.index + 1]
-            dx = target_x - self.x
-            dy = target_y - self.y
-            dist = (dx * dx + dy * dy) ** 0.5
-
-            if dist == 0:
-                self.index += 1
-                continue
-
-            if dist <= move_left:
-                # consume remaining distance to reach waypoint
-                self.x, self.y = target_x, target_y
-                self.index += 1
-                move_left -= dist
-            else:
-                # move partially toward waypoint
-                self.x += (dx / dist) * move_left
-                self.y += (dy / dist) * move_left
-                move_left = 0
+        self.distance = min(self.distance + self.speed, self.path.length)
+        self.x, self.y, self.segment = self.path.advance(self.distance, self.segment)
 
     def take_damage(self, damage):
         self.health -= damage
@@ -95,10 +77,12 @@ class Enemy:
         return 0
 
     def draw(self, screen):
+        image = assets.sprite(self.sprite_name)
+
         # Draw the enemy image centered at (self.x, self.y)
-        offset_x = self.width // 2
-        offset_y = self.height // 2
-        screen.blit(self.image, (self.x - offset_x, self.y - offset_y))
+        offset_x = image.get_width() // 2
+        offset_y = image.get_height() // 2
+        rect = screen.blit(image, (self.x - offset_x, self.y - offset_y))
 
         # Draw health bar above the enemy
         bar_width = 40
@@ -112,10 +96,22 @@ class Enemy:
         health_ratio = max(0, self.health / self.max_hp)
         pygame.draw.rect(screen, (0, 255, 0), (bar_x, bar_y, int(bar_width * health_ratio), bar_height))
         # Border
-        pygame.draw.rect(screen, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height), 2)
+        bar_rect = pygame.draw.rect(screen, (0, 0, 0), (bar_x, bar_y, bar_width, bar_height), 2)
+
+        # Area touched on screen (for dirty-rect updates)
+        return rect.union(bar_rect)
 
     def max_health(self):
         return self.max_hp
 
-def create_enemy(enemy_type, path, wave=1):
-    return Enemy(enemy_type, path, wave)
\ No newline at end of file
+# Enemies are recycled between waves instead of allocated per spawn
+enemy_pool = ObjectPool(Enemy)
+
+
+def create_enemy(enemy_type, path, wave=1, stats=None, scaling=None):
+    return enemy_pool.acquire(enemy_type, path, wave, stats, scaling)
+
+
+def release_enemy(enemy):
+    """Give a removed enemy back to the pool (it must not be used afterwards)."""
+    enemy_pool.release(enemy)
\ No newline at end of file
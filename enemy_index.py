@@ -0,0 +1,90 @@
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+# How a tower picks among the enemies in its range
+TARGETING_POLICIES = ("first", "last", "strongest", "weakest")
+
+_by_distance = attrgetter("distance")
+
+
+class ProgressIndex:
+    """Live enemies ordered by path progress (rearmost first).
+
+    Rebuilt lazily, at most once per frame: moving enemies only invalidate
+    it, and the first query after that re-sorts them. Queries are then
+    bisects over the distances. Equal progress keeps spawn order.
+    """
+
+    def __init__(self, enemies, store=None):
+        self.enemies = enemies   # the EntityList (or any iterable) being indexed
+        self.store = store       # EnemyStore holding them, if vectorized
+        self.order = []
+        self.distances = []
+        self.dirty = True
+
+    def invalidate(self):
+        """Enemies moved, spawned or left: rebuild before the next query."""
+        self.dirty = True
+
+    def _refresh(self):
+        if self.dirty:
+            if self.store is not None:
+                self.order, self.distances = self.store.progress_order()
+            else:
+                self.order = sorted(self.enemies, key=_by_distance)
+                self.distances = [enemy.distance for enemy in self.order]
+            self.dirty = False
+
+    def __len__(self):
+        self._refresh()
+        return len(self.order)
+
+    def rearmost(self):
+        """The enemy with the least progress (closest to the entrance), or None."""
+        self._refresh()
+        return self.order[0] if self.order else None
+
+    def target(self, coverage, policy="first"):
+        """Enemy a tower covering `coverage` (sorted (start, end) path distance
+        intervals, see coverage.py) should shoot under `policy`, or None."""
+        self._refresh()
+        order, distances = self.order, self.distances
+
+        if policy == "first":
+            # furthest along: the last enemy before the end of each stretch
+            for start, end in reversed(coverage):
+                i = bisect_right(distances, end) - 1
+                if i >= 0 and distances[i] >= start:
+                    return order[bisect_left(distances, distances[i])]
+            return None
+
+        if policy == "last":
+            for start, end in coverage:
+                i = bisect_left(distances, start)
+                if i < len(distances) and distances[i] <= end:
+                    return order[i]
+            return None
+
+        if policy not in ("strongest", "weakest"):
+            raise ValueError(f"Unknown targeting policy: {policy}")
+
+        # most / least health left, ties going to the one furthest along
+        best = None
+        strongest = policy == "strongest"
+        for start, end in reversed(coverage):
+            lo = bisect_left(distances, start)
+            for i in range(bisect_right(distances, end) - 1, lo - 1, -1):
+                enemy = order[i]
+                if (best is None or
+                        (enemy.health > best.health if strongest else enemy.health < best.health)):
+                    best = enemy
+        return best
+
+    def gap_before(self, start):
+        """Path distance from the nearest enemy behind `start` to `start`
+        (None if every enemy is at or past it)."""
+        self._refresh()
+        i = bisect_left(self.distances, start) - 1
+        if i < 0:
+            return None
+        return start - self.distances[i]
@@ -0,0 +1,185 @@
+try:
+    import numpy as np
+except ImportError:  # optional: only the vectorized enemy store needs it
+    np = None
+
+from enemy import Enemy
+
+
+class StoredEnemy:
+    """Per-enemy view into an EnemyStore.
+
+    Looks like an Enemy to the rest of the game (x/y, health, alive,
+    take_damage, draw), but the numbers live in the store's arrays. Once the
+    enemy leaves the store the view keeps its last position and reports
+    alive=False, so bullets still flying at it behave like with a dead Enemy.
+    """
+    generation = 0  # views are never reused (see Enemy.generation)
+
+    def __init__(self, store, slot, enemy):
+        self.store = store
+        self.slot = slot
+        self.type = enemy.type
+        self.reward = enemy.reward
+        self.max_hp = enemy.max_hp
+        self.sprite_name = enemy.sprite_name
+        self.reached_end = False
+        self._x = 0.0
+        self._y = 0.0
+        self._distance = 0.0
+        self._health = enemy.health
+
+    @property
+    def x(self):
+        return float(self.store.x[self.slot]) if self.slot is not None else self._x
+
+    @property
+    def y(self):
+        return float(self.store.y[self.slot]) if self.slot is not None else self._y
+
+    @property
+    def distance(self):
+        return float(self.store.dist[self.slot]) if self.slot is not None else self._distance
+
+    @property
+    def health(self):
+        return float(self.store.health[self.slot]) if self.slot is not None else self._health
+
+    @property
+    def alive(self):
+        return self.slot is not None and bool(self.store.alive[self.slot])
+
+    def take_damage(self, damage):
+        store, slot = self.store, self.slot
+        store.health[slot] -= damage
+        if store.health[slot] <= 0:
+            store.alive[slot] = False
+            return self.reward  # Reward for killing
+        return 0
+
+    def max_health(self):
+        return self.max_hp
+
+    # Same drawing code as Enemy; it only reads x / y / health / max_hp / sprite_name
+    draw = Enemy.draw
+
+
+class EnemyStore:
+    """Structure-of-arrays storage for every enemy walking one path.
+
+    Position, distance along the path, speed, health and alive flags are
+    NumPy arrays, and `step()` advances all enemies in one vectorized pass
+    (distance += speed, then position = interpolation between path corners)
+    instead of one Python `Enemy.move()` loop per enemy. Slots of enemies that
+    died or reached the end are recycled.
+    """
+
+    def __init__(self, path, capacity=256):
+        if np is None:
+            raise ImportError("EnemyStore needs numpy (python3 -m pip install numpy)")
+
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.dist = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.health = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.occupied = np.zeros(capacity, dtype=bool)
+        self.reached = np.zeros(capacity, dtype=bool)
+        self.spawned = np.zeros(capacity, dtype=np.int64)  # spawn order, breaks progress ties
+        self.spawn_count = 0
+
+        self.views = [None] * capacity
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.count = 0
+
+        self.set_path(path)
+
+    def set_path(self, path):
+        """Switch to a new graph.Path. Only valid while the store is empty (new wave)."""
+        pts = np.asarray(path.points, dtype=float)
+        self.path_x = pts[:, 0]
+        self.path_y = pts[:, 1]
+        self.path_dist = np.asarray(path.distances, dtype=float)
+        self.length = path.length
+
+    def _grow(self):
+        old = self.capacity
+        new = old * 2
+        for name in ("x", "y", "dist", "speed", "health", "alive", "occupied", "reached", "spawned"):
+            arr = getattr(self, name)
+            grown = np.zeros(new, dtype=arr.dtype)
+            grown[:old] = arr
+            setattr(self, name, grown)
+        self.views.extend([None] * old)
+        self.free_slots.extend(range(new - 1, old - 1, -1))
+        self.capacity = new
+
+    def spawn(self, enemy):
+        """Copy `enemy`'s stats into a free slot at the path start. Returns its view."""
+        if not self.free_slots:
+            self._grow()
+        slot = self.free_slots.pop()
+
+        self.x[slot] = self.path_x[0]
+        self.y[slot] = self.path_y[0]
+        self.dist[slot] = 0.0
+        self.speed[slot] = enemy.speed
+        self.health[slot] = enemy.health
+        self.alive[slot] = True
+        self.occupied[slot] = True
+        self.reached[slot] = False
+        self.spawned[slot] = self.spawn_count
+        self.spawn_count += 1
+
+        view = StoredEnemy(self, slot, enemy)
+        self.views[slot] = view
+        self.count += 1
+        return view
+
+    def _release(self, slot):
+        view = self.views[slot]
+        view._x = float(self.x[slot])
+        view._y = float(self.y[slot])
+        view._distance = float(self.dist[slot])
+        view._health = float(self.health[slot])
+        view.reached_end = bool(self.reached[slot])
+        view.slot = None
+
+        self.views[slot] = None
+        self.occupied[slot] = False
+        self.alive[slot] = False
+        self.free_slots.append(slot)
+        self.count -= 1
+        return view
+
+    def step(self):
+        """Move every live enemy by its speed. Returns the views that left the
+        store this frame (killed since the last step, or reached the end)."""
+        active = self.occupied & self.alive
+
+        # same rule as Enemy.move: an enemy standing on the last point leaves on its next move
+        at_end = active & (self.dist >= self.length)
+        self.reached |= at_end
+        self.alive &= ~at_end
+
+        moving = active & ~at_end
+        np.minimum(self.dist + np.where(moving, self.speed, 0.0), self.length, out=self.dist)
+        self.x[:] = np.interp(self.dist, self.path_dist, self.path_x)
+        self.y[:] = np.interp(self.dist, self.path_dist, self.path_y)
+
+        gone = np.flatnonzero(self.occupied & ~self.alive)
+        return [self._release(int(slot)) for slot in gone]
+
+    def progress_order(self):
+        """Views of the enemies in the store and their distances, sorted by
+        path progress (ties in spawn order, like sorting the enemies list)."""
+        slots = np.flatnonzero(self.occupied)
+        slots = slots[np.lexsort((self.spawned[slots], self.dist[slots]))]
+        views = self.views
+        return [views[slot] for slot in slots.tolist()], self.dist[slots].tolist()
+
+    def clear(self):
+        for slot in np.flatnonzero(self.occupied):
+            self._release(int(slot))
@@ -1,4 +1,5 @@
 import random
+from bisect import bisect_right
 from collections import deque
 from map import GRID_WIDTH, GRID_HEIGHT
 
@@ -19,8 +20,12 @@ class Graph:
     def neighbors(self, node):
         return self.adj.get(node, [])
 
-    def bfs_path(self, start, goal):
-        """BFS traversal that returns one shortest path (list of tiles)."""
+    def bfs_path(self, start, goal, rng=None):
+        """BFS traversal that returns one shortest path (list of tiles).
+
+        With `rng` (a random.Random or the random module) neighbors are visited
+        in shuffled order, so equally short paths vary from call to call.
+        """
         q = deque([start])
         parent = {start: None}
 
@@ -29,7 +34,12 @@ class Graph:
             if cur == goal:
                 break
 
-            for nxt in self.neighbors(cur):
+            nbrs = self.neighbors(cur)
+            if rng is not None:
+                nbrs = list(nbrs)
+                rng.shuffle(nbrs)
+
+            for nxt in nbrs:
                 if nxt not in parent:
                     parent[nxt] = cur
                     q.append(nxt)
@@ -46,14 +56,64 @@ class Graph:
         path.reverse()
         return path
 
+    def reachable(self, start):
+        """BFS flood fill: set of all nodes reachable from `start` (including it)."""
+        seen = {start}
+        q = deque([start])
+        while q:
+            cur = q.popleft()
+            for nxt in self.neighbors(cur):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    q.append(nxt)
+        return seen
+
+
+class GridGraph(Graph):
+    """The map grid as a persistent graph (owned by GameMap).
+
+    Edges between in-bounds tiles are built once; towers only block/unblock
+    nodes (O(1)) and neighbors() skips blocked tiles while traversing, so a new
+    path never needs a new graph. The top and bottom rows are not walkable.
+    """
+    DIRS = [(1,0), (-1,0), (0,1), (0,-1)]
+
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.blocked = set()
+
+        for x in range(width):
+            for y in range(1, height - 1):
+                u = (x, y)
+                self.add_node(u)
+                for dx, dy in self.DIRS:
+                    v = (x + dx, y + dy)
+                    if 0 <= v[0] < width and 1 <= v[1] < height - 1:
+                        self.adj[u].append(v)
+
+    def block(self, node):
+        self.blocked.add(node)
+
+    def unblock(self, node):
+        self.blocked.discard(node)
+
+    def is_open(self, node):
+        return node in self.adj and node not in self.blocked
+
+    def neighbors(self, node):
+        blocked = self.blocked
+        return [v for v in self.adj.get(node, []) if v not in blocked]
+
 
-def build_grid_graph(blocked_tiles):
+def build_grid_graph(blocked_tiles, width=GRID_WIDTH, height=GRID_HEIGHT):
     """Build a grid graph excluding blocked tiles (tower tiles)."""
     g = Graph()
     dirs = [(1,0), (-1,0), (0,1), (0,-1)]
 
-    for x in range(GRID_WIDTH):
-        for y in range(1, GRID_HEIGHT-1):
+    for x in range(width):
+        for y in range(1, height-1):
             u = (x, y)
             if u in blocked_tiles:
                 continue
@@ -63,45 +123,71 @@ def build_grid_graph(blocked_tiles):
 
             for dx, dy in dirs_shuffled:
                 v = (x + dx, y + dy)
-                if 0 <= v[0] < GRID_WIDTH and 1 <= v[1] < GRID_HEIGHT - 1 and v not in blocked_tiles:
+                if 0 <= v[0] < width and 1 <= v[1] < height - 1 and v not in blocked_tiles:
                     g.add_edge(u, v)
 
     return g
 
 
-def generate_path(blocked_tiles = None):
-    if blocked_tiles is None:
-        blocked_tiles = set()
-    # Random start/end anywhere on first/last column
-    start_y = random.randint(1, GRID_HEIGHT - 2)
-    end_y   = random.randint(1, GRID_HEIGHT - 2)
-    start = (0, start_y)
-    end   = (GRID_WIDTH - 1, end_y)
+def left_right_components(graph):
+    """Connected areas that link the left column to the right column.
+
+    One BFS per component touching the left column (usually just one), so
+    every tile is visited at most once. Returns a list of
+    (start tiles, end tiles, all tiles) - empty if the edges are cut off.
+    """
+    width, height = graph.width, graph.height
+    seen = set()
+    components = []
+    for y in range(1, height - 1):
+        s = (0, y)
+        if s in seen or not graph.is_open(s):
+            continue
+        tiles = graph.reachable(s)
+        seen |= tiles
+
+        ends = [(width - 1, ey) for ey in range(1, height - 1) if (width - 1, ey) in tiles]
+        if ends:
+            starts = [(0, sy) for sy in range(1, height - 1) if (0, sy) in tiles]
+            components.append((starts, ends, tiles))
+    return components
+
 
-    if start in blocked_tiles or end in blocked_tiles:
+def generate_path(graph=None, rng=random):
+    """Random winding left-to-right path over `graph` (a GridGraph).
+
+    Start, end and waypoints are only drawn from tiles that are reachable from
+    each other, so this succeeds on the first try whenever any left-to-right
+    route exists. Returns None if the towers cut the map in two.
+    """
+    if graph is None:
+        graph = GridGraph()
+    width = graph.width
+
+    components = left_right_components(graph)
+    if not components:
         return None
 
-    g = build_grid_graph(blocked_tiles)
+    # Random start anywhere on the first column (among tiles with a way out),
+    # random end on the last column within the same area
+    starts = [(s, ends, tiles) for comp_starts, ends, tiles in components for s in comp_starts]
+    start, ends, tiles = rng.choice(starts)
+    end = rng.choice(ends)
 
     # Choose 1 or 2 random waypoints to force a more winding path
-    waypoint_count = random.choice([1, 2])
-
-    waypoints = []
-    tries = 0
+    waypoint_count = rng.choice([1, 2])
 
     # Waypoints must move forward in x to avoid loopbacks/tails
     min_x = 1
-    max_x = GRID_WIDTH - 4  # keep away from the end to prevent ugly tails
+    max_x = width - 4  # keep away from the end to prevent ugly tails
+    candidates = sorted(t for t in tiles if min_x <= t[0] <= max_x)
 
-    while len(waypoints) < waypoint_count and tries < 60:
+    waypoints = []
+    tries = 0
+    while candidates and len(waypoints) < waypoint_count and tries < 60:
         tries += 1
-        wx = random.randint(min_x, max_x)
-        wy = random.randint(1, GRID_HEIGHT - 2)
-        w = (wx, wy)
-
-        if w in blocked_tiles:
-            continue
-        if any(wx == px for (px, py) in waypoints):
+        w = rng.choice(candidates)
+        if any(w[0] == px for (px, py) in waypoints):
             continue
 
         waypoints.append(w)
@@ -113,9 +199,8 @@ def generate_path(blocked_tiles = None):
 
     full = []
     for i in range(len(points) - 1):
-        seg = g.bfs_path(points[i], points[i+1])
-        if not seg:
-            return None
+        # all points are in one connected area, so every segment exists
+        seg = graph.bfs_path(points[i], points[i+1], rng)
 
         # join segments without duplicating connecting node
         if i > 0:
@@ -143,3 +228,76 @@ def path_to_pixels(path, tile_size):
     lx, ly = path[-1]
     pixel_path.append((lx * tile_size + tile_size // 2, ly * tile_size + tile_size // 2))
     return pixel_path
+
+
+class Path:
+    """Enemy path stored as corner points + cumulative distance at each corner.
+
+    Replaces the one-tuple-per-pixel list from path_to_pixels: memory grows
+    with the number of turns, not the number of pixels, and an enemy only
+    needs its distance travelled to know where it is.
+    """
+    def __init__(self, points):
+        self.points = points       # corner pixels (first and last included)
+        self.distances = [0.0]     # arc length from the start to each corner
+        for i in range(1, len(points)):
+            x1, y1 = points[i - 1]
+            x2, y2 = points[i]
+            self.distances.append(self.distances[-1] + ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5)
+        self.length = self.distances[-1]
+
+    @property
+    def start(self):
+        return self.points[0]
+
+    @property
+    def end(self):
+        return self.points[-1]
+
+    def _interpolate(self, distance, seg):
+        if seg >= len(self.points) - 1:
+            return self.points[-1]
+        x1, y1 = self.points[seg]
+        x2, y2 = self.points[seg + 1]
+        d1 = self.distances[seg]
+        t = (distance - d1) / (self.distances[seg + 1] - d1)
+        return x1 + (x2 - x1) * t, y1 + (y2 - y1) * t
+
+    def position_at(self, distance):
+        """(x, y) after `distance` pixels along the path (binary search, O(log n))."""
+        seg = bisect_right(self.distances, distance) - 1
+        seg = max(0, min(seg, len(self.points) - 1))
+        return self._interpolate(distance, seg)
+
+    def advance(self, distance, seg):
+        """Like position_at for a walker that only moves forward: starts from its
+        last segment `seg` (O(1) amortized). Returns (x, y, seg)."""
+        last = len(self.points) - 1
+        while seg < last and self.distances[seg + 1] <= distance:
+            seg += 1
+        x, y = self._interpolate(distance, seg)
+        return x, y, seg
+
+
+def build_path(tiles, tile_size):
+    """Tile path -> Path through the tile centers, keeping only the corners."""
+    if not tiles:
+        return None
+    half = tile_size // 2
+    centers = [(x * tile_size + half, y * tile_size + half) for x, y in tiles]
+
+    points = [centers[0]]
+    for i in range(1, len(centers) - 1):
+        px, py = points[-1]
+        cx, cy = centers[i]
+        nx, ny = centers[i + 1]
+        # drop the point only if the walk goes straight on through it: same
+        # line (cross product 0) and same way (dot product > 0). A U-turn at
+        # the tip of a dead-end spur is on the same line too, but is a corner.
+        straight = ((cx - px) * (ny - cy) == (cy - py) * (nx - cx) and
+                    (cx - px) * (nx - cx) + (cy - py) * (ny - cy) > 0)
+        if not straight:
+            points.append(centers[i])
+    if len(centers) > 1:
+        points.append(centers[-1])
+    return Path(points)
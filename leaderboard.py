@@ -0,0 +1,132 @@
+import heapq
+import os
+from algorithms import insertion_sort_desc
+
+SCORES_FILE = "scores.txt"
+TOP_K = 10            # scores shown on the leaderboard
+COMPACT_AFTER = 1000  # lines appended before the file is rewritten with just the top scores
+READ_CHUNK = 1 << 20  # bytes parsed at a time when catching up with the file
+
+
+class Leaderboard:
+    """High scores kept in a text file, one score per line.
+
+    Saving a score appends one line instead of rewriting the file. The best
+    `k` scores live in memory in a min-heap (the worst of them on top, so a
+    new score is compared against it and replaces it in O(log k)). The
+    file is only read again when its stat (inode, size, mtime) changed, and
+    then only from where the last read stopped. Opening the leaderboard is
+    one os.stat() however many scores were ever saved; only the first read
+    of a big history streams through the whole file.
+
+    Every `compact_after` appended lines the file is rewritten with just the
+    top `k` scores (the only ones anyone sees), written to a temp file and
+    renamed over the old one so a crash never leaves it half written.
+    """
+
+    def __init__(self, path=SCORES_FILE, k=TOP_K, compact_after=COMPACT_AFTER):
+        self.path = path
+        self.k = k
+        self.compact_after = compact_after
+        self._forget()
+
+    def _forget(self):
+        self.heap = []       # min-heap of the best k scores read so far
+        self.offset = 0      # bytes of the file already read
+        self.lines = 0       # scores in the file
+        self.stamp = None    # (inode, size, mtime) of the file at the last read
+        self.open_line = False  # the last score read had no newline after it
+        self._top = None     # cached scores(), best first
+
+    def _push(self, score):
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, score)
+        elif score > self.heap[0]:
+            heapq.heapreplace(self.heap, score)
+        else:
+            return
+        self._top = None
+
+    def refresh(self):
+        """Pick up scores written since the last read (by us or by anyone else)."""
+        stamp = self._stat_stamp()
+        if stamp is None:
+            if self.stamp is not None:
+                self._forget()
+            return
+        if stamp == self.stamp:
+            return
+        if (self.stamp is None or stamp[0] != self.stamp[0] or stamp[1] < self.offset
+                or self.open_line and not self._newline_at_offset()):
+            # first read, the file was replaced/compacted, or more digits were
+            # added to a last line read without its newline: start over
+            self._forget()
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            while True:
+                chunk = f.read(READ_CHUNK)
+                end = chunk.rfind(b"\n") + 1  # a half-written last line is read next time
+                if end == 0:
+                    break
+                self.offset += end
+                f.seek(self.offset)
+                scores = [int(field) for field in chunk[:end].split()]
+                self.lines += len(scores)
+                if len(scores) > self.k:
+                    scores = heapq.nlargest(self.k, scores)
+                for score in scores:
+                    self._push(score)
+                self.open_line = False
+
+        # `chunk` now holds what follows the last newline. A last line with
+        # no newline (e.g. edited by hand) counts once the file has stopped
+        # changing; while it is still being written it is read next time.
+        if chunk.strip() and self._stat_stamp() == stamp:
+            self.offset += len(chunk)
+            self.lines += 1
+            self._push(int(chunk))
+            self.open_line = True
+        self.stamp = stamp
+
+    def _stat_stamp(self):
+        """(inode, size, mtime) of the file, or None if it does not exist."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _newline_at_offset(self):
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            return f.read(1) in (b"\n", b"\r")
+
+    def scores(self):
+        """The top scores, best first."""
+        self.refresh()
+        if self._top is None:
+            # Custom sorting algorithm (no built-in .sort()); at most k values.
+            self._top = insertion_sort_desc(list(self.heap))
+        return self._top
+
+    def add(self, score):
+        self.refresh()
+        with open(self.path, "a") as f:
+            if self.open_line:
+                f.write("\n")  # last line had no newline (edited by hand)
+            f.write(f"{int(score)}\n")
+        self.refresh()
+        if self.lines > self.k + self.compact_after:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the file with only the top scores."""
+        self.refresh()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            for score in self.scores():
+                f.write(f"{score}\n")
+        os.replace(tmp, self.path)
+        self._forget()
+        self.refresh()
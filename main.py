@@ -1,20 +1,22 @@
+import time
+STARTED = time.perf_counter()  # time-to-first-frame is measured from here
+import threading
 import pygame
-from structures import Queue, Stack
-from enemy import create_enemy
-from tower import create_tower
-from map import GameMap, TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
-from scores import load_scores, save_score
+from map import TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
+from leaderboard import Leaderboard
 from build_menu import BuildMenu
-from graph import generate_path, path_to_pixels
 from tower_menu import TowerMenu
-import random
-pygame.init()
-pygame.mixer.init()
-
-
-pygame.mixer.music.load("resources/CaveBeast.mp3")
-pygame.mixer.music.set_volume(1.0)  
-pygame.mixer.music.play(-1)          
+from tower import Tower
+from assets import assets
+from simulation import Simulation
+from render import DirtyRects
+from profiler import FrameProfiler
+from replay import save_recording
+from enemy_index import TARGETING_POLICIES
+# Only what the menu needs comes up before the first frame; audio and
+# sprites are loaded by a background thread while the menu is shown
+pygame.display.init()
+pygame.font.init()
 
 
 SCREEN_WIDTH = GRID_WIDTH * TILE_SIZE
@@ -25,13 +27,23 @@ pygame.display.set_caption("Tower Defense - Smooth Path")
 
 clock = pygame.time.Clock()
 font = pygame.font.SysFont(None, 26)
+small_font = pygame.font.SysFont(None, 20)
+
+# Only changed screen areas are presented; static screens are drawn once
+renderer = DirtyRects(screen)
+
+# F3 toggles per-phase frame timings (overlay), F4 saves them as CSV
+profiler = FrameProfiler()
+
+# top scores cached in memory; scores.txt is only re-read when it changes
+leaderboard = Leaderboard()
 
 MENU, GAME, LEADERBOARD, GAME_OVER = 0, 1, 2, 3
 state = MENU
+drawn_state = None
 
-enemy_queue = Queue()
-tower_stack = Stack()
-game_map = GameMap()
+# All game logic lives in the (headless) simulation; this file only handles input + drawing
+sim = None
 build_menu = None
 pending_tile = None
 
@@ -39,90 +51,57 @@ selected_tower = None
 show_range = False
 tower_menu = None
 
-coins = 200
-score = 0
-health = 20
-
-wave = 1
-MAX_WAVES = 5
-
-towers = []
-enemies = []
-bullets = []
-
-current_path_tiles = []
-current_path_pixels = []
-
-spawn_timer = 0
-spawn_interval = 30  # frames @60fps = 0.30 seconds between spawns
-
-SPAWN_GAP_PIXELS = 24
+shown_wave = 0
 
-# ------------------- WAVE SYSTEM -------------------
-def start_wave(wave_number):
-    global current_path_tiles, current_path_pixels
-    global spawn_timer, spawn_interval
+notice = ""          # short message under the HUD (e.g. saved profile)
+notice_timer = 0     # frames left to show it
 
-    global selected_tower, show_range, tower_menu
-    selected_tower = None
-    show_range = False
-    tower_menu = None
-
-    enemy_queue.clear()
-    enemies.clear()
-    spawn_timer = 0
-    spawn_interval = max(20, 36 - wave_number)  # slightly faster spawns in later waves
 
-    # Blocked tiles = all towers placed so far (from previous waves too)
-    blocked = {t.tile for t in towers}
+# Every game's inputs + seed are saved here when it ends (python3 replay.py last_game.json)
+REPLAY_FILE = "last_game.json"
 
-    # Try multiple times because start/end are random and can fail
-    current_path_tiles = None
-    for _ in range(80):
-        current_path_tiles = generate_path(blocked)
-        if current_path_tiles:
-            break
 
-    if not current_path_tiles:
-        # If it fails (rare), keep previous path and just continue
-        return
+# ------------------- BACKGROUND LOADING -------------------
+def load_resources():
+    """Start the music, decode the laser sound and every sprite (plus the
+    rotated tower/bullet frames the first shots draw). Runs on a thread
+    while the menu is up, so neither the first frame nor the first tower
+    placement waits on the disk or the decoder."""
+    start = time.perf_counter()
+    try:
+        pygame.mixer.init()
+        pygame.mixer.music.load("resources/CaveBeast.mp3")
+        pygame.mixer.music.set_volume(1.0)
+        pygame.mixer.music.play(-1)
+        Tower.load_sound()
+    except pygame.error as e:
+        print(f"Audio unavailable: {e}")
 
-    game_map.set_path(current_path_tiles)
-    current_path_pixels = path_to_pixels(current_path_tiles, TILE_SIZE)
+    assets.preload()
+    assets.preload([name for name in assets.sprite_table if name.startswith("tower_")] + ["bullet"],
+                   rotations=True)
+    print(f"Music and sprites loaded in the background in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print(f"Asset cache: {assets.stats()}")
 
-    enemy_count = 5 + wave_number * 3
 
-    enemy_types = []
-    for i in range(enemy_count):
-        enemy_type = min(3, (i // 3) + 1)
-        enemy_types.append(enemy_type)
-
-    random.shuffle(enemy_types)
-
-    for enemy_type in enemy_types:
-        enemy_queue.enqueue(create_enemy(enemy_type, current_path_pixels, wave_number))
+loader = threading.Thread(target=load_resources, name="resource-loader", daemon=True)
+first_frame_ms = None  # startup time until the menu was on screen
 
 
+def wait_for_resources():
+    if loader.ident is None:
+        loader.start()  # ENTER came before the first frame
+    loader.join()  # usually long done; never play with sprites half loaded
 
 # ------------------- RESET GAME -------------------
 def reset_game():
-    global coins, score, health, wave
-    global towers, bullets, enemies, enemy_queue, tower_stack
-    global current_path_tiles, current_path_pixels, build_menu, pending_tile
+    global sim, build_menu, pending_tile, shown_wave
     global selected_tower, show_range, tower_menu
-    global game_map  # <-- IMPORTANT
-
-    coins = 200
-    score = 0
-    health = 20
-    wave = 1
 
-    towers = []
-    bullets = []
-    enemies = []
-
-    tower_stack.clear()
-    enemy_queue.clear()
+    if sim is not None:
+        sim.close()  # hand the last game's enemies/bullets back to the pools
+    sim = Simulation()
+    shown_wave = sim.wave
 
     build_menu = None
 
@@ -132,29 +111,28 @@ def reset_game():
 
     pending_tile = None
 
-    game_map = GameMap()  # <-- now it truly resets the global map
-    current_path_tiles = []
-    current_path_pixels = []
-
-    start_wave(wave)
-
-# ------------------- DRAW PATH -------------------
-def draw_path(screen, path_pixels):
-    if len(path_pixels) >= 2:
-        pygame.draw.lines(screen, (0,150,255), False, path_pixels, 6)
-
 # ------------------- MAIN LOOP -------------------
 running = True
 while running:
-    screen.fill((30,30,30))
+    # only hold the profiler while it is on (disabled = one None check per phase)
+    prof = profiler if profiler.enabled and state == GAME else None
+    if prof is not None:
+        prof.begin_frame()
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+            if state == GAME:
+                save_recording(sim, REPLAY_FILE)
+
+        # window was covered/restored: present everything again
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            renderer.invalidate()
 
         # -------- MENU --------
         if state == MENU and event.type == pygame.KEYDOWN:
             if event.key == pygame.K_RETURN:
+                wait_for_resources()
                 reset_game()
                 state = GAME
             elif event.key == pygame.K_l:
@@ -177,26 +155,23 @@ while running:
         elif state == GAME:
             # --- UNDO LAST TOWER (STACK POP) ---
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_u:
-                    last = tower_stack.pop()
-                    if last is not None:
+                if event.key == pygame.K_F3:
+                    profiler.toggle()
 
-                        # remove from active towers list (source of truth)
-                        if last in towers:
-                            towers.remove(last)
+                elif event.key == pygame.K_F4 and profiler.rows:
+                    csv_path = time.strftime("profile_%Y%m%d_%H%M%S.csv")
+                    rows = profiler.export_csv(csv_path)
+                    notice = f"Saved {rows} frames to {csv_path}"
+                    notice_timer = 180
 
-                        # free the tile (becomes buildable again)
-                        tx, ty = last.tile
-                        game_map.buildable[tx][ty] = True
+                elif event.key == pygame.K_u:
+                    last = sim.undo()
 
-                        # refund 60% (same rule as selling)
-                        coins += int(last.cost * 0.6)
-
-                        # if undo removed the selected tower, close its menu
-                        if selected_tower == last:
-                            selected_tower = None
-                            tower_menu = None
-                            show_range = False
+                    # if undo removed the selected tower, close its menu
+                    if last is not None and selected_tower == last:
+                        selected_tower = None
+                        tower_menu = None
+                        show_range = False
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mx, my = pygame.mouse.get_pos()
@@ -209,19 +184,13 @@ while running:
                     if action == "toggle_range":
                         show_range = not show_range
 
-                    elif action == "sell":
-                        coins += tower_menu.refund
-
-                        # free tile
-                        game_map.buildable[selected_tower.tile[0]][selected_tower.tile[1]] = True
-
-                        # remove from towers list
-                        if selected_tower in towers:
-                            towers.remove(selected_tower)
+                    elif action == "targeting":
+                        # cycle first -> last -> strongest -> weakest
+                        i = TARGETING_POLICIES.index(selected_tower.targeting)
+                        sim.set_targeting(selected_tower, TARGETING_POLICIES[(i + 1) % len(TARGETING_POLICIES)])
 
-                        # remove from stack so undo doesn't bring it back
-                        if selected_tower in tower_stack.items:
-                            tower_stack.items.remove(selected_tower)
+                    elif action == "sell":
+                        sim.sell_tower(selected_tower, tower_menu.refund_ratio)
 
                         # clear selection/menu
                         selected_tower = None
@@ -237,37 +206,23 @@ while running:
 
                 # 2) If build_menu is open, handle buying (your existing code)
                 elif build_menu:
-                    choice = build_menu.handle_click((mx, my), coins)
+                    choice = build_menu.handle_click((mx, my), sim.coins)
                     if choice and pending_tile:
-                        tower = create_tower(
-                            choice,
-                            pending_tile[0] * TILE_SIZE + TILE_SIZE // 2,
-                            pending_tile[1] * TILE_SIZE + TILE_SIZE // 2,
-                            pending_tile
-                        )
-                        if coins >= tower.cost:
-                            coins -= tower.cost
-                            towers.append(tower)
-                            tower_stack.push(tower)
-                            game_map.buildable[pending_tile[0]][pending_tile[1]] = False
+                        sim.place_tower(choice, pending_tile)
 
                     build_menu = None
                     pending_tile = None
 
                 # 3) Otherwise: click tower -> open tower menu, else open build menu like normal
                 else:
-                    clicked = None
-                    for t in towers:
-                        if t.tile == clicked_tile:
-                            clicked = t
-                            break
+                    clicked = sim.tower_at(clicked_tile)
 
                     if clicked:
                         selected_tower = clicked
                         show_range = False
                         tower_menu = TowerMenu(
                             min(mx, SCREEN_WIDTH - 230),
-                            min(my, SCREEN_HEIGHT - 90),
+                            min(my, SCREEN_HEIGHT - 120),
                             clicked
                         )
                     else:
@@ -275,118 +230,117 @@ while running:
                         tower_menu = None
                         show_range = False
 
-                        if game_map.is_buildable(clicked_tile):
+                        if sim.game_map.is_buildable(clicked_tile):
                             build_menu = BuildMenu(min(mx, SCREEN_WIDTH - 160), min(my, SCREEN_HEIGHT - 120))
                             pending_tile = clicked_tile
 
     # ------------------- DRAW STATES -------------------
-    if state == MENU:
+    if state != drawn_state:
+        drawn_state = state
+        renderer.invalidate()
+
+    # static screens: draw + present only when something changed
+    if state != GAME and renderer.needs_redraw:
+        screen.fill((30,30,30))
+
+    if state == MENU and renderer.needs_redraw:
         screen.blit(font.render("TOWER DEFENSE", True, (255,255,255)), (SCREEN_WIDTH//2-100, 200))
         screen.blit(font.render("ENTER - Start", True, (200,200,200)), (SCREEN_WIDTH//2-80, 250))
         screen.blit(font.render("L - Leaderboard", True, (200,200,200)), (SCREEN_WIDTH//2-80, 290))
         screen.blit(font.render("Q - Quit Game", True, (200,200,200)), (SCREEN_WIDTH//2-80, 330))
+        renderer.present()
 
 
     elif state == GAME:
-        game_map.draw(screen)
-        draw_path(screen, current_path_pixels)
-
-        # spawn enemies (timed + entrance gating)
-        spawn_timer += 1
-        if spawn_timer >= spawn_interval and not enemy_queue.is_empty():
-            sx, sy = current_path_pixels[0]
-
-            # Find the enemy closest to the start (lowest index, then nearest distance)
-            def d2_to_start(e):
-                dx = e.x - sx
-                dy = e.y - sy
-                return dx * dx + dy * dy
-
-            entrance_clear = True
-            if enemies:
-                closest = min(enemies, key=lambda e: (e.index, d2_to_start(e)))
-                if d2_to_start(closest) < (SPAWN_GAP_PIXELS * SPAWN_GAP_PIXELS):
-                    entrance_clear = False
-
-            if entrance_clear:
-                spawn_timer = 0
-                e = enemy_queue.dequeue()
-                e.x, e.y = sx, sy
-                e.index = 0
-                enemies.append(e)
-            else:
-                # keep trying next frame (don't reset timer so it spawns ASAP when clear)
-                spawn_timer = spawn_interval
-
-        # update enemies
-        for enemy in enemies[:]:
-            enemy.move()
-            if enemy.reached_end:
-                health -= 1
-                enemies.remove(enemy)
-            elif not enemy.alive:
-                enemies.remove(enemy)
-
-        # towers shoot
-        for tower in towers:
-            tower.shoot(enemies, bullets)
-
-        # bullets
-        for bullet in bullets[:]:
-            reward = bullet.move()
-            if reward:
-                coins += reward
-                score += reward
-            if not bullet.alive:
-                bullets.remove(bullet)
-
-        # draw entities
-        for enemy in enemies:
-            enemy.draw(screen)
-        for tower in towers:
-            tower.draw(
+        if prof is not None:
+            prof.lap("input")
+        sim.profiler = prof
+        sim.step()
+
+        # starting a new wave closes any open tower selection
+        if sim.wave != shown_wave:
+            shown_wave = sim.wave
+            selected_tower = None
+            show_range = False
+            tower_menu = None
+
+        # grid + path line come pre-rendered from the map's cached background;
+        # erase last frame's sprites from it (plus any tiles that just changed)
+        changed = sim.game_map.render_background(screen)
+        renderer.restore(sim.game_map.background, changed)
+        if prof is not None:
+            prof.lap("background")
+
+        # draw entities (every drawn area is recorded for the display update)
+        for enemy in sim.enemies:
+            renderer.add(enemy.draw(screen))
+        for tower in sim.towers:
+            renderer.add(tower.draw(
                 screen,
                 show_range=(tower is selected_tower and show_range)
-            )
-        for bullet in bullets:
-            bullet.draw(screen)
+            ))
+        for bullet in sim.bullets:
+            renderer.add(bullet.draw(screen))
+        if prof is not None:
+            prof.lap("entities")
 
         if build_menu:
-            build_menu.draw(screen, font, coins)
+            renderer.add(build_menu.draw(screen, font, sim.coins))
 
         if tower_menu and selected_tower:
-            tower_menu.draw(screen, font, show_range_now=show_range)
+            renderer.add(tower_menu.draw(screen, font, show_range_now=show_range))
 
         # UI
-        ui_text = f"Health: {health}   Coins: {coins}   Score: {score}   Wave: {wave}/{MAX_WAVES}"
-        screen.blit(font.render(ui_text, True, (255,255,255)), (10,10))
+        ui_text = f"Health: {sim.health}   Coins: {sim.coins}   Score: {sim.score}   Wave: {sim.wave}/{sim.max_waves}"
+        renderer.add(screen.blit(font.render(ui_text, True, (255,255,255)), (10,10)))
+
+        if notice_timer > 0:
+            notice_timer -= 1
+            renderer.add(screen.blit(font.render(notice, True, (255,120,120)), (10,34)))
+
+        if profiler.enabled:
+            renderer.add(profiler.draw(screen, small_font))
+        if prof is not None:
+            prof.lap("ui")
+
+        renderer.present()
+        if prof is not None:
+            prof.lap("present")
+            prof.end_frame(enemies=len(sim.enemies), towers=len(sim.towers), bullets=len(sim.bullets))
 
         # GAME OVER
-        if health <= 0:
-            save_score(score)
+        if sim.game_over:
+            leaderboard.add(sim.score)
+            save_recording(sim, REPLAY_FILE)
             state = GAME_OVER
 
-        # NEXT WAVE
-        if enemy_queue.is_empty() and not enemies:
-            if wave < MAX_WAVES:
-                wave += 1
-                start_wave(wave)
-            else:
-                save_score(score)
-                state = LEADERBOARD
+        # ALL WAVES CLEARED
+        elif sim.victory:
+            leaderboard.add(sim.score)
+            save_recording(sim, REPLAY_FILE)
+            state = LEADERBOARD
 
-    elif state == GAME_OVER:
+    elif state == GAME_OVER and renderer.needs_redraw:
         screen.blit(font.render("GAME OVER", True, (255,80,80)), (SCREEN_WIDTH//2-80, SCREEN_HEIGHT//2-50))
         screen.blit(font.render("Press ENTER to return to menu", True, (200,200,200)), (SCREEN_WIDTH//2-130, SCREEN_HEIGHT//2-10))
+        renderer.present()
 
-    elif state == LEADERBOARD:
+    elif state == LEADERBOARD and renderer.needs_redraw:
         screen.blit(font.render("LEADERBOARD", True, (255,255,255)), (SCREEN_WIDTH//2-80, 150))
-        scores = load_scores()
+        scores = leaderboard.scores()
         for i, s in enumerate(scores):
             screen.blit(font.render(f"{i+1}. {s}", True, (200,200,200)), (SCREEN_WIDTH//2-50, 200 + i*30))
         screen.blit(font.render("ESC - Back", True, (180,180,180)), (SCREEN_WIDTH - 500, 150))
+        renderer.present()
+
+    if first_frame_ms is None:
+        first_frame_ms = (time.perf_counter() - STARTED) * 1000
+        print(f"First frame after {first_frame_ms:.0f} ms")
+        if loader.ident is None:
+            loader.start()  # only now, so it doesn't compete with the first frame
 
-    pygame.display.update()
     clock.tick(60)
 
+if loader.is_alive():
+    loader.join()  # don't shut pygame down under the loader
 pygame.quit()
\ No newline at end of file
@@ -4,34 +4,135 @@ TILE_SIZE = 40  # smaller tile for bigger grid
 GRID_WIDTH = 30
 GRID_HEIGHT = 17
 
+PATH_COLOR = (0,150,255)
+
+# Per-tile state bits in GameMap.cells (a tile with no bits set is buildable)
+TILE_PATH = 1     # on the current enemy path
+TILE_TOWER = 2    # a tower stands here
+
 class GameMap:
-    def __init__(self):
-        self.buildable = [[True for _ in range(GRID_HEIGHT)] for _ in range(GRID_WIDTH)]
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, tile_size=TILE_SIZE):
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+
+        # One byte per tile (index x * height + y): O(1) checks at any grid size
+        self.cells = bytearray(width * height)
+        self.towers = {}          # tile -> tower standing on it
         self.path_tiles = []
+        self.path_points = []     # corner pixels of the enemy path line
 
-    def is_buildable(self, tile):
+        # Walkable grid for path generation; kept in sync with tower placement
+        # (local import: graph.py imports the grid constants from this module)
+        from graph import GridGraph
+        self.graph = GridGraph(width, height)
+
+        # Pre-rendered grid + path (built on first draw, then only dirty tiles are redrawn)
+        self.background = None
+        self.dirty_tiles = set()
+
+    def _index(self, tile):
+        """Flat index of `tile`, or -1 if it is off the map."""
         x, y = tile
-        return self.buildable[x][y] and (tile not in self.path_tiles)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return x * self.height + y
+        return -1
+
+    def _cell(self, tile):
+        """Flat index of `tile` for writing; off-map tiles are an error (a -1
+        would silently write to the last tile)."""
+        i = self._index(tile)
+        if i < 0:
+            raise IndexError(f"tile {tile} is off the {self.width}x{self.height} map")
+        return i
+
+    def is_buildable(self, tile):
+        i = self._index(tile)
+        return i >= 0 and self.cells[i] == 0
 
     def is_traversable(self, tile):
-        x, y = tile
-        return self.buildable[x][y]
+        i = self._index(tile)
+        return i >= 0 and not self.cells[i] & TILE_TOWER
 
-    def occupy_tile(self, tile):
-        x, y = tile
-        self.buildable[x][y] = False
+    def is_path(self, tile):
+        i = self._index(tile)
+        return i >= 0 and bool(self.cells[i] & TILE_PATH)
+
+    def tower_at(self, tile):
+        return self.towers.get(tile)
+
+    def occupy_tile(self, tile, tower=None):
+        self.cells[self._cell(tile)] |= TILE_TOWER
+        if tower is not None:
+            self.towers[tile] = tower
+        self.graph.block(tile)
+        self.dirty_tiles.add(tile)
+
+    def free_tile(self, tile):
+        self.cells[self._cell(tile)] &= ~TILE_TOWER
+        self.towers.pop(tile, None)
+        self.graph.unblock(tile)
+        self.dirty_tiles.add(tile)
+
+    def set_path(self, path_tiles, path=None):
+        """New enemy path: tile list + (optional) graph.Path for the path line."""
+        # old and new path tiles both change color / line
+        cells = self.cells
+        for tile in self.path_tiles:
+            cells[self._cell(tile)] &= ~TILE_PATH
+            self.dirty_tiles.add(tile)
+        for tile in path_tiles:
+            cells[self._cell(tile)] |= TILE_PATH
+            self.dirty_tiles.add(tile)
 
-    def set_path(self, path_tiles):
         self.path_tiles = path_tiles
+        self.path_points = path.points if path is not None else []
+
+    # ------------------- DRAW -------------------
+    def _draw_tile(self, surface, x, y):
+        size = self.tile_size
+        rect = pygame.Rect(x*size, y*size, size, size)
+        color = (50,50,50) if self.is_buildable((x,y)) else (80,80,80)
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, (30,30,30), rect, 1)
+        return rect
+
+    def _draw_path_line(self, surface):
+        if len(self.path_points) >= 2:
+            pygame.draw.lines(surface, PATH_COLOR, False, self.path_points, 6)
+            for point in self.path_points:
+                pygame.draw.circle(surface, PATH_COLOR, point, 3)  # fill the corner joints
+
+    def render_background(self, screen):
+        """Redraw the cached background: everything the first time, then only
+        the tiles changed by towers / a new path. Returns the redrawn rects."""
+        if self.background is None:
+            self.background = pygame.Surface(screen.get_size(), 0, screen)
+            for x in range(self.width):
+                for y in range(self.height):
+                    self._draw_tile(self.background, x, y)
+            self._draw_path_line(self.background)
+            self.dirty_tiles.clear()
+            return [self.background.get_rect()]
+
+        if not self.dirty_tiles:
+            return []
+
+        rects = []
+        for x, y in self.dirty_tiles:
+            rect = self._draw_tile(self.background, x, y)
+            rects.append(rect)
+
+            # restore the part of the path line that runs through this tile
+            if self.is_path((x, y)):
+                self.background.set_clip(rect)
+                self._draw_path_line(self.background)
+                self.background.set_clip(None)
+        self.dirty_tiles.clear()
+        return rects
 
-    def draw(self, screen, path_tiles=None):
-        for x in range(GRID_WIDTH):
-            for y in range(GRID_HEIGHT):
-                rect = pygame.Rect(x*TILE_SIZE, y*TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                color = (50,50,50) if self.is_buildable((x,y)) else (80,80,80)
-                pygame.draw.rect(screen, color, rect)
-                pygame.draw.rect(screen, (30,30,30), rect, 1)
-        if path_tiles:
-            for x, y in path_tiles:
-                rect = pygame.Rect(x*TILE_SIZE, y*TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                pygame.draw.rect(screen, (0,100,255), rect)
\ No newline at end of file
+    def draw(self, screen):
+        """Grid + path line as a single blit of the cached background."""
+        changed = self.render_background(screen)
+        screen.blit(self.background, (0, 0))
+        return changed
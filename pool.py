@@ -0,0 +1,46 @@
+class ObjectPool:
+    """Free list of reusable game objects (bullets, enemies).
+
+    `acquire(*args)` hands back a released object re-initialised with
+    `obj.reset(*args)`, and only calls `cls(*args)` when the free list is
+    empty. Pooled classes need `reset()` and a `pooled` attribute.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0    # most objects out at the same time
+        self.allocations = 0   # objects ever created (cls(...) calls)
+        self.reuses = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reuses += 1
+        else:
+            obj = self.cls(*args)
+            self.allocations += 1
+        obj.pooled = False
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        if obj.pooled:
+            return  # already back in the pool
+        obj.pooled = True
+        self.free.append(obj)
+        self.in_use -= 1
+
+    def stats(self):
+        return {
+            "pool_size": len(self.free),
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "allocations": self.allocations,
+            "reuses": self.reuses,
+        }
@@ -0,0 +1,143 @@
+import csv
+import time
+from collections import deque
+
+import pygame
+
+# Rolling window for the overlay percentiles (5 seconds @60fps)
+PROFILE_WINDOW = 300
+# Per-frame rows kept for CSV export (10 minutes @60fps)
+MAX_CSV_ROWS = 60 * 60 * 10
+# Overlay text is rebuilt every this many frames, not every frame
+OVERLAY_REFRESH = 15
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list (p in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class FrameProfiler:
+    """Splits each frame into named phases with perf_counter laps.
+
+    The frame loop calls `begin_frame()`, then `lap(phase)` after each phase
+    (the time since the previous lap goes to `phase`), then `end_frame()`.
+    Callers only hold a reference while `enabled` is True, so a disabled
+    profiler costs one `is not None` check per phase.
+    """
+
+    def __init__(self, window=PROFILE_WINDOW, max_rows=MAX_CSV_ROWS):
+        self.enabled = False
+        self.window = window
+        self.phases = []           # phase names, in first-seen order
+        self.history = {}          # phase -> deque of the last `window` ms values
+        self.rows = deque(maxlen=max_rows)  # per-frame (frame, {phase: ms}, counts)
+        self.counts = {}           # entity counts of the last frame
+        self.frames = 0
+        self._current = {}
+        self._last = 0.0
+        self._overlay = None       # cached overlay Surface
+        self._overlay_age = OVERLAY_REFRESH
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def reset(self):
+        self.phases.clear()
+        self.history.clear()
+        self.rows.clear()
+        self.counts = {}
+        self.frames = 0
+        self._overlay = None
+
+    # ------------------- RECORDING -------------------
+    def begin_frame(self):
+        self._current = {}
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self, **counts):
+        """Close the frame; `counts` (e.g. enemies=12) are shown and exported with it."""
+        timings = self._current
+        timings["total"] = sum(timings.values())
+        for phase, ms in timings.items():
+            samples = self.history.get(phase)
+            if samples is None:
+                samples = deque(maxlen=self.window)
+                self.history[phase] = samples
+                self.phases.append(phase)
+            samples.append(ms)
+
+        self.frames += 1
+        self.counts = counts
+        self.rows.append((self.frames, timings, counts))
+        self._current = {}
+
+    # ------------------- REPORTING -------------------
+    def summary(self):
+        """[(phase, p50 ms, p99 ms)] over the rolling window, "total" last."""
+        result = []
+        for phase in self.phases:
+            if phase == "total":
+                continue
+            ordered = sorted(self.history[phase])
+            result.append((phase, percentile(ordered, 50), percentile(ordered, 99)))
+        if "total" in self.history:
+            ordered = sorted(self.history["total"])
+            result.append(("total", percentile(ordered, 50), percentile(ordered, 99)))
+        return result
+
+    def export_csv(self, path):
+        """Write one row per recorded frame (ms per phase + entity counts). Returns rows written."""
+        phases = [p for p in self.phases if p != "total"] + ["total"]
+        count_keys = []
+        for _, _, counts in self.rows:
+            for key in counts:
+                if key not in count_keys:
+                    count_keys.append(key)
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{p}_ms" for p in phases] + count_keys)
+            for frame, timings, counts in self.rows:
+                writer.writerow(
+                    [frame]
+                    + [f"{timings.get(p, 0.0):.4f}" for p in phases]
+                    + [counts.get(k, "") for k in count_keys]
+                )
+        return len(self.rows)
+
+    def draw(self, screen, font, right=None, top=10):
+        """Overlay with p50/p99 per phase and entity counts. Returns the drawn rect."""
+        self._overlay_age += 1
+        if self._overlay is None or self._overlay_age >= OVERLAY_REFRESH:
+            self._overlay_age = 0
+            self._overlay = self._render(font)
+
+        rect = self._overlay.get_rect()
+        rect.top = top
+        rect.right = screen.get_width() - 10 if right is None else right
+        return screen.blit(self._overlay, rect)
+
+    def _render(self, font):
+        lines = [f"{'phase':<10}{'p50':>7}{'p99':>7}  ms"]
+        for phase, p50, p99 in self.summary():
+            lines.append(f"{phase:<10}{p50:7.2f}{p99:7.2f}")
+        lines.append("  ".join(f"{k}: {v}" for k, v in self.counts.items()))
+
+        line_height = font.get_linesize()
+        texts = [font.render(line, True, (220, 255, 220)) for line in lines]
+        width = max(t.get_width() for t in texts) + 12
+        surface = pygame.Surface((width, line_height * len(texts) + 8), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        for i, text in enumerate(texts):
+            surface.blit(text, (6, 4 + i * line_height))
+        return surface
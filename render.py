@@ -0,0 +1,67 @@
+import pygame
+
+# Past this many rects a single full update is cheaper than the rect list
+MAX_DIRTY_RECTS = 150
+
+
+class DirtyRects:
+    """Dirty-rectangle bookkeeping for pygame.display.update(rects).
+
+    Every frame the rects drawn last frame are restored from the background,
+    everything drawn this frame is recorded, and only the union of both is
+    presented. `invalidate()` forces one full redraw + update (state change,
+    window exposed, new map). Static screens use `needs_redraw` to skip
+    drawing and presenting while nothing changes.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.previous = []   # rects drawn last frame (to erase now)
+        self.current = []    # rects drawn this frame
+        self.full = True
+
+    def invalidate(self):
+        self.full = True
+
+    @property
+    def needs_redraw(self):
+        return self.full
+
+    def add(self, rect):
+        if rect is None:
+            return
+        rect = rect.clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.current.append(rect)
+
+    def extend(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def restore(self, background, changed=()):
+        """Start a frame over a static `background`: erase last frame's sprites
+        (or blit it all after invalidate()) and repaint background `changed` rects."""
+        if self.full:
+            self.screen.blit(background, (0, 0))
+            return
+
+        for rect in self.previous:
+            self.screen.blit(background, rect, rect)
+        for rect in changed:
+            self.screen.blit(background, rect, rect)
+            self.add(rect)
+
+    def present(self):
+        if self.full:
+            pygame.display.update()
+        else:
+            rects = self.previous + self.current
+            if len(rects) > MAX_DIRTY_RECTS:
+                pygame.display.update()
+            elif rects:
+                pygame.display.update(rects)
+
+        self.previous = self.current
+        self.current = []
+        self.full = False
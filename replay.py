@@ -0,0 +1,156 @@
+"""Record a game's inputs and replay them headless, as fast as the CPU allows.
+
+A recording is the Simulation's seed plus its input log (tower placements,
+sells, undos and targeting changes, each with the frame it happened on).
+Replaying it on a fresh Simulation with the same seed reproduces the game
+frame for frame, so a reported slowdown can be re-run and profiled without
+playing by hand.
+
+    python3 replay.py last_game.json
+    python3 replay.py last_game.json --profile frames.csv
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout pure JSON
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+
+from simulation import Simulation
+
+RECORDING_VERSION = 1
+
+
+def make_recording(sim):
+    """Everything needed to replay `sim`'s game, plus how it ended (for checking)."""
+    return {
+        "version": RECORDING_VERSION,
+        "seed": sim.seed,
+        "max_waves": sim.max_waves,
+        "vectorized": sim.vectorized,
+        "options": sim.options(),
+        "inputs": list(sim.inputs),
+        "result": result_of(sim),
+    }
+
+
+def result_of(sim):
+    return {
+        "frame": sim.frame,
+        "wave": sim.wave,
+        "health": sim.health,
+        "coins": sim.coins,
+        "score": sim.score,
+        "game_over": sim.game_over,
+        "victory": sim.victory,
+    }
+
+
+def save_recording(sim, path):
+    with open(path, "w") as f:
+        json.dump(make_recording(sim), f)
+
+
+def load_recording(path):
+    with open(path) as f:
+        recording = json.load(f)
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"{path}: unsupported recording version {recording.get('version')}")
+    return recording
+
+
+def apply_input(sim, event):
+    """Re-issue one logged player action on `sim`."""
+    action = event["action"]
+    if action == "place":
+        sim.place_tower(event["tower"], tuple(event["tile"]))
+    elif action == "sell":
+        tower = sim.tower_at(tuple(event["tile"]))
+        if tower is not None:
+            sim.sell_tower(tower, event["refund_ratio"])
+    elif action == "undo":
+        sim.undo()
+    elif action == "target":
+        tower = sim.tower_at(tuple(event["tile"]))
+        if tower is not None:
+            sim.set_targeting(tower, event["policy"])
+    else:
+        raise ValueError(f"Unknown input action: {action}")
+
+
+def replay(recording, max_frames=None, vectorized=None, profiler=None):
+    """Run `recording` on a new Simulation until the game ends (or `max_frames`).
+
+    Inputs logged at frame F are applied before step F + 1, like in the game
+    loop. With a FrameProfiler every step is recorded per phase.
+    Returns the finished Simulation.
+    """
+    options = {"vectorized": recording.get("vectorized", False)}
+    options.update(recording.get("options", {}))
+    options.update(max_waves=recording["max_waves"], seed=recording["seed"])
+    if vectorized is not None:
+        options["vectorized"] = vectorized
+    sim = Simulation(**options)
+    pending = deque(recording["inputs"])
+    sim.profiler = profiler
+
+    while not sim.finished and (max_frames is None or sim.frame < max_frames):
+        while pending and pending[0]["frame"] <= sim.frame:
+            apply_input(sim, pending.popleft())
+
+        if profiler is not None:
+            profiler.begin_frame()
+            sim.step()
+            profiler.end_frame(enemies=len(sim.enemies), towers=len(sim.towers), bullets=len(sim.bullets))
+        else:
+            sim.step()
+
+    # the game may end on the frame an input was logged (nothing after it runs)
+    while pending and pending[0]["frame"] <= sim.frame:
+        apply_input(sim, pending.popleft())
+    return sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded game without a display")
+    parser.add_argument("recording", help="JSON file written by the game (or save_recording)")
+    parser.add_argument("--max-frames", type=int,
+                        help="stop after this many frames (default: where the recording stopped)")
+    parser.add_argument("--vectorized", action="store_true", help="use the NumPy enemy store")
+    parser.add_argument("--profile", metavar="CSV", help="write per-frame phase timings here")
+    args = parser.parse_args(argv)
+
+    recording = load_recording(args.recording)
+    max_frames = args.max_frames
+    if max_frames is None and "result" in recording:
+        max_frames = recording["result"]["frame"]  # e.g. the window was closed mid-game
+
+    profiler = None
+    if args.profile:
+        from profiler import FrameProfiler
+        profiler = FrameProfiler(window=None)  # percentiles over the whole game
+
+    start = time.perf_counter()
+    sim = replay(recording, max_frames, args.vectorized or None, profiler)
+    seconds = time.perf_counter() - start
+
+    result = result_of(sim)
+    sim.close()
+    report = {
+        "result": result,
+        "matches_recording": result == recording.get("result"),
+        "seconds": round(seconds, 3),
+        "frames_per_second": round(sim.frame / seconds) if seconds else None,
+    }
+    if profiler is not None:
+        report["profile_rows"] = profiler.export_csv(args.profile)
+        report["profile"] = {phase: {"p50_ms": round(p50, 4), "p99_ms": round(p99, 4)}
+                             for phase, p50, p99 in profiler.summary()}
+    print(json.dumps(report, indent=2))
+    return 0 if report["matches_recording"] or args.max_frames is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import heapq
+import math
+
+
+class FireScheduler:
+    """Decides which towers look for a target on which frame.
+
+    A tower placed on frame P may fire on frames P + k * fire_rate (the frames
+    its reload timer used to run out on). The next of those frames for every
+    tower sits in a heap, so a frame only touches the towers that are due.
+
+    A due tower with nothing in range is not rescheduled for its next reload
+    but put to sleep: enemies only move forward along the path, at most
+    `max_speed` pixels per frame, and new ones start at distance 0, so the
+    gap from each enemy to the next stretch of path the tower covers gives
+    the first frame anything could be in range, and the tower skips every
+    check before it. Idle and reloading towers cost nothing per frame, and
+    towers still fire on exactly the same frames as before.
+    """
+
+    def __init__(self):
+        self.heap = []         # (check frame, placement order, tower)
+        self.next_check = {}   # tower -> its scheduled frame (heap entries that differ are stale)
+        self.placed_at = {}    # tower -> (placement frame, placement order)
+        self.order = 0
+
+    def __len__(self):
+        return len(self.placed_at)
+
+    def clear(self):
+        self.heap.clear()
+        self.next_check.clear()
+        self.placed_at.clear()
+
+    def add(self, tower, frame):
+        """Start scheduling `tower`, placed on `frame` (first check one reload later)."""
+        self.order += 1
+        self.placed_at[tower] = (frame, self.order)
+        self._schedule(tower, frame + tower.fire_rate)
+
+    def remove(self, tower):
+        if self.placed_at.pop(tower, None) is not None:
+            self.next_check.pop(tower, None)  # its heap entry becomes stale
+
+    def _schedule(self, tower, frame):
+        self.next_check[tower] = frame
+        heapq.heappush(self.heap, (frame, self.placed_at[tower][1], tower))
+
+    def _on_rhythm(self, tower, frame):
+        """First of the tower's reload frames at or after `frame`."""
+        placed = self.placed_at[tower][0]
+        rate = tower.fire_rate
+        return placed + -(-(frame - placed) // rate) * rate
+
+    def wake_all(self, frame):
+        """Enemies or spawn point changed (new wave): every sleeping tower looks
+        again on its first reload frame from `frame` on."""
+        for tower in self.placed_at:
+            due = self._on_rhythm(tower, frame)
+            if self.next_check.get(tower, math.inf) > due:
+                self._schedule(tower, due)
+
+    def _sleep(self, tower, frame, index, spawning, max_speed):
+        """Nothing in range on `frame`: schedule the first reload frame on which
+        an enemy (or a new spawn) could have walked into range."""
+        coverage = tower.coverage
+        gap = math.inf
+        if coverage:
+            if spawning:
+                gap = coverage[0][0]  # new enemies start at distance 0
+            # nobody is inside a stretch (the tower would have fired), so the
+            # enemy nearest behind each stretch is the next one to reach it
+            for start, _ in coverage:
+                behind = index.gap_before(start)
+                if behind is not None:
+                    gap = min(gap, behind)
+
+        if gap == math.inf:
+            # path out of range, or nobody left to come: wait for wake_all()
+            self.next_check.pop(tower, None)
+            return
+
+        frames = int(gap / max_speed)  # rounded down: never late
+        self._schedule(tower, self._on_rhythm(tower, frame + max(1, frames)))
+
+    def step(self, frame, index, bullets, spawning, max_speed):
+        """Let every tower due on `frame` fire (in placement order). Returns shots fired.
+
+        `index` is the ProgressIndex of the live enemies, `spawning` tells
+        whether more enemies are queued, `max_speed` is the fastest an enemy
+        can move per frame. Towers need their `coverage`.
+        """
+        heap = self.heap
+        fired = 0
+        while heap and heap[0][0] <= frame:
+            due, _, tower = heapq.heappop(heap)
+            if self.next_check.get(tower) != due:
+                continue  # sold / undone, or rescheduled since
+            del self.next_check[tower]
+
+            if tower.fire(index.enemies, bullets, index=index):
+                fired += 1
+                self._schedule(tower, due + tower.fire_rate)
+            else:
+                self._sleep(tower, due, index, spawning, max_speed)
+        return fired
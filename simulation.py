@@ -0,0 +1,426 @@
+import random
+from structures import RingQueue, UndoStack, EntityList
+from enemy import create_enemy, release_enemy, ENEMY_STATS, WAVE_SCALING
+from bullet import release_bullet
+from tower import create_tower, TOWER_STATS
+from enemy_index import ProgressIndex, TARGETING_POLICIES
+from map import GameMap, TILE_SIZE, GRID_WIDTH, GRID_HEIGHT
+from graph import generate_path, build_path
+from scheduler import FireScheduler
+from coverage import coverage_intervals, CoverageIndex
+from enemy_store import EnemyStore
+
+MAX_WAVES = 5
+START_COINS = 200
+START_HEALTH = 20
+SELL_REFUND_RATIO = 0.60
+
+SPAWN_GAP_PIXELS = 24
+
+# enemies in wave n: WAVE_BASE + n * WAVE_GROWTH
+WAVE_BASE = 5
+WAVE_GROWTH = 3
+
+
+def stat_tables(overrides=None):
+    """(enemy stats, wave scaling, tower stats) with `overrides` applied.
+
+    `overrides` is a partial table such as
+    {"enemies": {3: {"max_hp": 90}}, "wave_scaling": {"hp": 0.1},
+     "towers": {"Sniper": {"damage": 30}}}; enemy types may be strings
+    (as after a JSON round trip).
+    """
+    overrides = overrides or {}
+    enemies = {t: dict(s) for t, s in ENEMY_STATS.items()}
+    for t, s in overrides.get("enemies", {}).items():
+        enemies.setdefault(int(t), {}).update(s)
+    scaling = dict(WAVE_SCALING, **overrides.get("wave_scaling", {}))
+    towers = {t: dict(s) for t, s in TOWER_STATS.items()}
+    for t, s in overrides.get("towers", {}).items():
+        towers.setdefault(t, {}).update(s)
+    return enemies, scaling, towers
+
+
+class Simulation:
+    """All GAME-state logic (waves, spawning, movement, shooting, economy).
+
+    Runs without a display, audio or loaded sprites: entities only touch
+    pygame when they are drawn, so `step()` can be called as fast as the CPU
+    allows (soak tests, balance checks on CI boxes with no screen).
+    main.py drives one of these and only adds input handling and drawing.
+
+    With `vectorized=True` enemies live in a NumPy EnemyStore and all of them
+    move in one array operation per frame (for waves of thousands of enemies).
+
+    All randomness (paths, wave order) comes from `self.rng`, seeded with
+    `seed` (a random one if not given), and every player action is logged in
+    `self.inputs` with its frame number, so a game can be replayed exactly
+    (see replay.py).
+
+    Map size, wave size and spawn pacing default to the game's values and
+    can be raised for stress runs (see stress.py); `options()` lists them.
+    `stats` overrides enemy/tower stats for balance runs (see stat_tables).
+    """
+
+    def __init__(self, max_waves=MAX_WAVES, vectorized=False, seed=None,
+                 width=GRID_WIDTH, height=GRID_HEIGHT, tile_size=TILE_SIZE,
+                 wave_base=WAVE_BASE, wave_growth=WAVE_GROWTH,
+                 spawn_interval=None, spawn_gap=SPAWN_GAP_PIXELS, stats=None):
+        self.max_waves = max_waves
+        self.vectorized = vectorized
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.width = width
+        self.height = height
+        self.tile_size = tile_size
+        self.wave_base = wave_base
+        self.wave_growth = wave_growth
+        self.fixed_spawn_interval = spawn_interval  # None: faster spawns in later waves
+        self.spawn_gap = spawn_gap                  # min pixels between spawned enemies
+        self.stats = stats
+        self.enemy_stats, self.wave_scaling, self.tower_stats = stat_tables(stats)
+        self.enemy_store = None
+        self.enemy_queue = RingQueue(64)
+        self.tower_stack = UndoStack()
+        self.enemies = EntityList()
+        self.progress = ProgressIndex(self.enemies)  # enemies by path progress, for targeting
+        self.bullets = EntityList()
+        self.towers = EntityList()
+        self.fire_scheduler = FireScheduler()
+        self.profiler = None  # FrameProfiler; step() records its phases while set
+        self.reset()
+
+    def options(self):
+        """Constructor arguments that recreate this game from the start."""
+        return {
+            "max_waves": self.max_waves,
+            "vectorized": self.vectorized,
+            "seed": self.seed,
+            "width": self.width,
+            "height": self.height,
+            "tile_size": self.tile_size,
+            "wave_base": self.wave_base,
+            "wave_growth": self.wave_growth,
+            "spawn_interval": self.fixed_spawn_interval,
+            "spawn_gap": self.spawn_gap,
+            "stats": self.stats,
+        }
+
+    # ------------------- RESET GAME -------------------
+    def reset(self):
+        self.coins = START_COINS
+        self.score = 0
+        self.health = START_HEALTH
+        self.wave = 1
+        self.frame = 0
+        self.rng = random.Random(self.seed)
+        self.inputs = []  # player actions: {"frame", "action", ...} (see _log_input)
+
+        # hand pooled entities from a previous game back first
+        self.close()
+        self.enemy_store = None
+        self.progress.store = None
+
+        self.towers.clear()
+        self.tower_stack.clear()
+        self.fire_scheduler.clear()
+
+        self.game_map = GameMap(self.width, self.height, self.tile_size)
+        self.current_path_tiles = []
+        self.current_path = None
+        self._coverage_index = None  # CoverageIndex, rebuilt on demand
+
+        self.spawn_timer = 0
+        self.spawn_interval = 30  # frames @60fps = 0.30 seconds between spawns
+
+        self.game_over = False   # health ran out
+        self.victory = False     # last wave cleared
+
+        self.start_wave(self.wave)
+
+    def close(self):
+        """Give every queued and live enemy and bullet back to the pools.
+
+        The pools are shared by all games, so call this before dropping a
+        Simulation (reset() does it too); otherwise its entities are never reused.
+        """
+        self._release_enemies()
+        for bullet in self.bullets:
+            release_bullet(bullet)
+        self.bullets.clear()
+
+    @property
+    def finished(self):
+        return self.game_over or self.victory
+
+    # ------------------- WAVE SYSTEM -------------------
+    def _release_enemies(self):
+        """Drop every queued and walking enemy, returning them to the pool."""
+        for enemy in self.enemy_queue:
+            release_enemy(enemy)
+        self.enemy_queue.clear()
+
+        if self.enemy_store is not None:
+            self.enemy_store.clear()  # its views are not pooled
+        else:
+            for enemy in self.enemies:
+                release_enemy(enemy)
+        self.enemies.clear()
+        self.progress.invalidate()
+
+    def start_wave(self, wave_number):
+        self._release_enemies()
+
+        # fastest any enemy of this wave can walk (lets idle towers sleep safely)
+        fastest = max(stats["speed"] for stats in self.enemy_stats.values())
+        self.max_enemy_speed = fastest * (1.0 + self.wave_scaling["speed"] * (wave_number - 1))
+        self.fire_scheduler.wake_all(self.frame + 1)
+        self.spawn_timer = 0
+        if self.fixed_spawn_interval is not None:
+            self.spawn_interval = self.fixed_spawn_interval
+        else:
+            self.spawn_interval = max(20, 36 - wave_number)  # slightly faster spawns in later waves
+
+        # The map's grid graph already has every placed tower blocked.
+        # Endpoints are picked among reachable tiles, so one attempt is enough.
+        path_tiles = generate_path(self.game_map.graph, self.rng)
+
+        if not path_tiles:
+            # Towers cut the map in two: keep previous path and just continue
+            return
+
+        self.current_path_tiles = path_tiles
+        self.current_path = build_path(path_tiles, self.tile_size)
+        self.game_map.set_path(path_tiles, self.current_path)
+        for tower in self.towers:
+            self._update_coverage(tower)
+
+        if self.vectorized:
+            if self.enemy_store is None:
+                self.enemy_store = EnemyStore(self.current_path)
+            else:
+                self.enemy_store.set_path(self.current_path)
+            self.progress.store = self.enemy_store
+
+        enemy_count = self.wave_base + wave_number * self.wave_growth
+        if self.enemy_queue.capacity < enemy_count:
+            self.enemy_queue = RingQueue(enemy_count)
+
+        enemy_types = []
+        for i in range(enemy_count):
+            enemy_type = min(3, (i // 3) + 1)
+            enemy_types.append(enemy_type)
+
+        self.rng.shuffle(enemy_types)
+
+        for enemy_type in enemy_types:
+            self.enemy_queue.enqueue(create_enemy(
+                enemy_type, self.current_path, wave_number, self.enemy_stats, self.wave_scaling
+            ))
+
+    # ------------------- TOWERS -------------------
+    def _log_input(self, action, **args):
+        # logged before it is applied, at the frame it happened (before the next step)
+        self.inputs.append(dict(frame=self.frame, action=action, **args))
+
+    def _update_coverage(self, tower):
+        """Path distances `tower` can hit on the current path (see coverage.py)."""
+        if self.current_path is None:
+            tower.coverage = []
+        else:
+            tower.coverage = coverage_intervals(self.current_path, tower.x, tower.y, tower.range)
+        self._coverage_index = None
+
+    def towers_covering(self, distance):
+        """Towers that can hit an enemy `distance` pixels along the current path."""
+        if self._coverage_index is None:
+            self._coverage_index = CoverageIndex(self.towers)
+        return self._coverage_index.towers_at(distance)
+
+    def set_targeting(self, tower, policy):
+        """Change which enemy in range `tower` shoots (see enemy_index.TARGETING_POLICIES)."""
+        if policy not in TARGETING_POLICIES:
+            raise ValueError(f"Unknown targeting policy: {policy}")
+        self._log_input("target", tile=list(tower.tile), policy=policy)
+        tower.targeting = policy
+
+    def tower_at(self, tile):
+        return self.game_map.tower_at(tile)
+
+    def place_tower(self, tower_type, tile):
+        """Buy a tower on `tile`. Returns the tower, or None if not affordable/buildable.
+
+        Path tiles are not buildable, so the current path always stays open
+        and towers can never cut the left edge off from the right one.
+        """
+        self._log_input("place", tower=tower_type, tile=list(tile))
+        if not self.game_map.is_buildable(tile):
+            return None
+
+        size = self.tile_size
+        tower = create_tower(
+            tower_type,
+            tile[0] * size + size // 2,
+            tile[1] * size + size // 2,
+            tile,
+            self.tower_stats
+        )
+        if self.coins < tower.cost:
+            return None
+
+        self.coins -= tower.cost
+        self._update_coverage(tower)
+        self.towers.append(tower)
+        self.fire_scheduler.add(tower, self.frame)
+        tower.undo_handle = self.tower_stack.push(tower)
+        self.game_map.occupy_tile(tile, tower)
+        return tower
+
+    def _remove_tower(self, tower):
+        # remove from active towers list (source of truth)
+        if tower in self.towers:
+            self.towers.remove(tower)
+            self.towers.compact()
+            self.fire_scheduler.remove(tower)
+            self._coverage_index = None
+
+        # free the tile (becomes buildable again)
+        self.game_map.free_tile(tower.tile)
+
+    def sell_tower(self, tower, refund_ratio=SELL_REFUND_RATIO):
+        """Sell a placed tower. Returns the refund."""
+        self._log_input("sell", tile=list(tower.tile), refund_ratio=refund_ratio)
+        refund = int(tower.cost * refund_ratio)
+        self.coins += refund
+        self._remove_tower(tower)
+
+        # cancel its undo entry so undo doesn't bring it back
+        self.tower_stack.invalidate(tower.undo_handle)
+        return refund
+
+    def undo(self):
+        """Undo the last placed tower (stack pop). Returns the removed tower or None."""
+        self._log_input("undo")
+        last = self.tower_stack.pop()
+        if last is None:
+            return None
+
+        self._remove_tower(last)
+
+        # refund 60% (same rule as selling)
+        self.coins += int(last.cost * SELL_REFUND_RATIO)
+        return last
+
+    # ------------------- FRAME UPDATE -------------------
+    def step(self):
+        """Advance the game by one frame (1/60 s of game time)."""
+        if self.finished:
+            return
+
+        prof = self.profiler
+        self.frame += 1
+        self._spawn()
+        if prof is not None:
+            prof.lap("spawn")
+
+        # update enemies
+        if self.enemy_store is not None:
+            # one vectorized move for everyone; only the ones that left come back
+            for enemy in self.enemy_store.step():
+                if enemy.reached_end:
+                    self.health -= 1
+                self.enemies.remove(enemy)
+        else:
+            for enemy in self.enemies:
+                enemy.move()
+                if enemy.reached_end:
+                    self.health -= 1
+                    self.enemies.remove(enemy)
+                    release_enemy(enemy)
+                elif not enemy.alive:
+                    self.enemies.remove(enemy)
+                    release_enemy(enemy)
+        self.progress.invalidate()
+
+        if prof is not None:
+            prof.lap("enemies")
+
+        # towers shoot: only the ones whose reload ends this frame, and of
+        # those, idle ones sleep until an enemy comes near (see FireScheduler)
+        self.fire_scheduler.step(self.frame, self.progress, self.bullets,
+                                 not self.enemy_queue.is_empty(), self.max_enemy_speed)
+        if prof is not None:
+            prof.lap("towers")
+
+        # bullets
+        for bullet in self.bullets:
+            reward = bullet.move()
+            if reward:
+                self.coins += reward
+                self.score += reward
+            if not bullet.alive:
+                self.bullets.remove(bullet)
+                release_bullet(bullet)
+
+        # squeeze out the holes left by removals (only when they pile up)
+        self.enemies.compact()
+        self.bullets.compact()
+        if prof is not None:
+            prof.lap("bullets")
+
+        # GAME OVER
+        if self.health <= 0:
+            self.game_over = True
+
+        # NEXT WAVE
+        elif self.enemy_queue.is_empty() and not self.enemies:
+            if self.wave < self.max_waves:
+                self.wave += 1
+                self.start_wave(self.wave)
+            else:
+                self.victory = True
+
+        if prof is not None:
+            prof.lap("waves")
+
+    def _spawn(self):
+        # spawn enemies (timed + entrance gating)
+        self.spawn_timer += 1
+        if self.spawn_timer < self.spawn_interval or self.enemy_queue.is_empty():
+            return
+
+        sx, sy = self.current_path.start
+
+        # The enemy closest to the start (least distance travelled)
+        closest = self.progress.rearmost()
+
+        entrance_clear = True
+        if closest is not None:
+            dx = closest.x - sx
+            dy = closest.y - sy
+            if dx * dx + dy * dy < self.spawn_gap * self.spawn_gap:
+                entrance_clear = False
+
+        if entrance_clear:
+            self.spawn_timer = 0
+            e = self.enemy_queue.dequeue()
+            if self.enemy_store is not None:
+                # the store copies the stats; the Enemy object itself can be reused
+                view = self.enemy_store.spawn(e)
+                release_enemy(e)
+                e = view
+            else:
+                e.x, e.y = sx, sy
+                e.distance = 0.0
+                e.segment = 0
+            self.enemies.append(e)
+            self.progress.invalidate()
+        else:
+            # keep trying next frame (don't reset timer so it spawns ASAP when clear)
+            self.spawn_timer = self.spawn_interval
+
+    def run(self, max_frames):
+        """Step until the game ends or `max_frames` frames have run. Returns frames run."""
+        start = self.frame
+        while not self.finished and self.frame - start < max_frames:
+            self.step()
+        return self.frame - start
@@ -0,0 +1,69 @@
+from map import TILE_SIZE
+
+
+class SpatialHash:
+    """Uniform grid index (one bucket per map tile) for "what is near (x, y)?" queries.
+
+    Rebuilt at most once per frame after enemies move (lazily, on the first
+    query of the frame); a range query only looks at the buckets overlapping
+    the query circle, so its cost depends on how many entities are nearby,
+    not on how many exist.
+    """
+
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> list of (insert order, item)
+        self.count = 0
+        self._pending = None  # items to index before the next query
+
+    def clear(self):
+        self.cells.clear()
+        self.count = 0
+        self._pending = None
+
+    def cell_of(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item):
+        key = self.cell_of(item.x, item.y)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            bucket = []
+            self.cells[key] = bucket
+        bucket.append((self.count, item))
+        self.count += 1
+
+    def rebuild(self, items):
+        self.clear()
+        for item in items:
+            self.insert(item)
+
+    def invalidate(self, items):
+        """`items` have moved: re-index them before the next query (if there is one)."""
+        self._pending = items
+
+    def query(self, x, y, radius):
+        """Items within `radius` of (x, y), in the order they were inserted."""
+        if self._pending is not None:
+            self.rebuild(self._pending)
+
+        size = self.cell_size
+        min_cx, min_cy = int((x - radius) // size), int((y - radius) // size)
+        max_cx, max_cy = int((x + radius) // size), int((y + radius) // size)
+        r2 = radius * radius
+
+        found = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for order, item in bucket:
+                    dx = item.x - x
+                    dy = item.y - y
+                    if dx * dx + dy * dy <= r2:
+                        found.append((order, item))
+
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, item in found]
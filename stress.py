@@ -0,0 +1,164 @@
+"""Stress / load mode: a big map, huge waves and many towers, headless by default.
+
+Reports sustained FPS and frame-time percentiles, so the scaling limits
+show up here before they show up for players.
+
+    python3 stress.py                                   # 200x120 grid, 5000-enemy wave, 500 towers
+    python3 stress.py --vectorized --frames 6000
+    python3 stress.py --width 60 --height 34 --wave-size 1000 --towers 100 --draw
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # keep stdout pure JSON
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from simulation import Simulation
+from profiler import percentile
+from enemy import enemy_pool
+from bullet import bullet_pool
+
+TOWER_TYPES = ("Bazooka", "Sniper", "Shotgun")
+FRAME_BUDGET_MS = 1000 / 60
+FPS_WINDOW = 60  # frames per "sustained FPS" window
+
+
+def place_towers(sim, count, rng):
+    """Place `count` towers (for free) on buildable tiles, nearest the path first.
+
+    Returns the number placed.
+    """
+    path = set(sim.current_path_tiles)
+    near, far = [], []
+    for x in range(sim.width):
+        for y in range(1, sim.height - 1):
+            tile = (x, y)
+            if not sim.game_map.is_buildable(tile):
+                continue
+            close = any((x + dx, y + dy) in path for dx in (-2, -1, 0, 1, 2) for dy in (-2, -1, 0, 1, 2))
+            (near if close else far).append(tile)
+    rng.shuffle(near)
+    rng.shuffle(far)
+
+    placed = 0
+    for tile in near + far:
+        if placed >= count:
+            break
+        sim.coins += 1000  # stress runs don't care about the economy
+        if sim.place_tower(rng.choice(TOWER_TYPES), tile) is not None:
+            placed += 1
+    return placed
+
+
+def _draw_frame(sim, screen, pygame):
+    sim.game_map.draw(screen)
+    for enemy in sim.enemies:
+        enemy.draw(screen)
+    for tower in sim.towers:
+        tower.draw(screen)
+    for bullet in sim.bullets:
+        bullet.draw(screen)
+    pygame.display.flip()
+
+
+def run_stress(width=200, height=120, tile_size=8, wave_size=5000, waves=1, towers=500,
+               frames=3000, seed=0, vectorized=False, spawn_interval=1, spawn_gap=0, draw=False):
+    """Run one stress game; returns a JSON-serializable report."""
+    setup_start = time.perf_counter()
+    sim = Simulation(max_waves=waves, vectorized=vectorized, seed=seed,
+                     width=width, height=height, tile_size=tile_size,
+                     wave_base=wave_size, wave_growth=0,
+                     spawn_interval=spawn_interval, spawn_gap=spawn_gap)
+    placed = place_towers(sim, towers, random.Random(seed))
+    setup_seconds = time.perf_counter() - setup_start
+
+    screen = None
+    if draw:
+        import pygame
+        from assets import assets
+        pygame.init()
+        screen = pygame.display.set_mode((width * tile_size, height * tile_size))
+        pygame.display.set_caption("Tower Defense - Stress")
+        assets.preload()
+
+    frame_ms = []
+    peak = {"enemies": 0, "bullets": 0}
+    clock = time.perf_counter
+    run_start = clock()
+    while not sim.finished and sim.frame < frames:
+        start = clock()
+        sim.step()
+        if screen is not None:
+            pygame.event.pump()
+            _draw_frame(sim, screen, pygame)
+        frame_ms.append((clock() - start) * 1000)
+
+        peak["enemies"] = max(peak["enemies"], len(sim.enemies))
+        peak["bullets"] = max(peak["bullets"], len(sim.bullets))
+    run_seconds = clock() - run_start
+    sim.close()
+
+    asset_stats = None
+    if screen is not None:
+        asset_stats = assets.stats()  # sprite cache hits/misses and load times
+        pygame.quit()
+
+    ordered = sorted(frame_ms)
+    # worst FPS over any FPS_WINDOW consecutive frames
+    windows = [sum(frame_ms[i:i + FPS_WINDOW]) for i in range(0, len(frame_ms), FPS_WINDOW)]
+    worst_window = max(windows) if windows else 0.0
+
+    return {
+        "config": dict(sim.options(), towers=towers, frames=frames, draw=draw),
+        "towers_placed": placed,
+        "setup_seconds": round(setup_seconds, 3),
+        "frames_run": len(frame_ms),
+        "finished": sim.finished,
+        "health": sim.health,
+        "peak": peak,
+        # free list size, high-water mark and allocations of the entity pools
+        "pools": {"enemies": enemy_pool.stats(), "bullets": bullet_pool.stats()},
+        "assets": asset_stats,
+        "fps": {
+            "sustained": round(len(frame_ms) / run_seconds, 1) if run_seconds else None,
+            "worst_window": round(FPS_WINDOW * 1000 / worst_window, 1) if worst_window else None,
+        },
+        "frame_ms": {
+            "p50": round(percentile(ordered, 50), 3),
+            "p90": round(percentile(ordered, 90), 3),
+            "p99": round(percentile(ordered, 99), 3),
+            "p99.9": round(percentile(ordered, 99.9), 3),
+            "max": round(ordered[-1], 3) if ordered else 0.0,
+            "over_budget": sum(1 for ms in frame_ms if ms > FRAME_BUDGET_MS),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tower defense stress test (JSON report)")
+    parser.add_argument("--width", type=int, default=200, help="grid width in tiles")
+    parser.add_argument("--height", type=int, default=120, help="grid height in tiles")
+    parser.add_argument("--tile-size", type=int, default=8, help="tile size in pixels")
+    parser.add_argument("--wave-size", type=int, default=5000, help="enemies per wave")
+    parser.add_argument("--waves", type=int, default=1)
+    parser.add_argument("--towers", type=int, default=500, help="towers placed before the first frame")
+    parser.add_argument("--frames", type=int, default=3000, help="stop after this many frames")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vectorized", action="store_true", help="use the NumPy enemy store")
+    parser.add_argument("--spawn-interval", type=int, default=1, help="frames between spawns")
+    parser.add_argument("--spawn-gap", type=int, default=0, help="min pixels between spawned enemies")
+    parser.add_argument("--draw", action="store_true", help="also draw every frame in a window")
+    args = parser.parse_args(argv)
+
+    report = run_stress(args.width, args.height, args.tile_size, args.wave_size, args.waves,
+                        args.towers, args.frames, args.seed, args.vectorized,
+                        args.spawn_interval, args.spawn_gap, args.draw)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,3 +26,178 @@ class Queue:
 
     def clear(self):
         self.items.clear()
+
+class RingQueue:
+    """Fixed-capacity FIFO queue on a circular buffer.
+
+    enqueue/dequeue/peek are O(1) (Queue.dequeue is O(n) because of
+    list.pop(0)). Enqueueing into a full queue raises OverflowError.
+    """
+    def __init__(self, capacity):
+        self.buffer = [None] * capacity
+        self.capacity = capacity
+        self.head = 0     # index of the front item
+        self.size = 0
+
+    def enqueue(self, item):
+        if self.size == self.capacity:
+            raise OverflowError("queue is full")
+        self.buffer[(self.head + self.size) % self.capacity] = item
+        self.size += 1
+
+    def dequeue(self):
+        if self.size == 0:
+            return None
+        item = self.buffer[self.head]
+        self.buffer[self.head] = None
+        self.head = (self.head + 1) % self.capacity
+        self.size -= 1
+        return item
+
+    def peek(self):
+        return self.buffer[self.head] if self.size else None
+
+    def is_empty(self):
+        return self.size == 0
+
+    def is_full(self):
+        return self.size == self.capacity
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """Front to back."""
+        for i in range(self.size):
+            yield self.buffer[(self.head + i) % self.capacity]
+
+    def clear(self):
+        for i in range(self.capacity):
+            self.buffer[i] = None
+        self.head = 0
+        self.size = 0
+
+
+class UndoEntry:
+    """Handle returned by UndoStack.push (pass it to invalidate())."""
+    __slots__ = ("item", "live")
+
+    def __init__(self, item):
+        self.item = item
+        self.live = True
+
+
+class UndoStack:
+    """Stack whose pushed entries can be cancelled later in O(1).
+
+    push() returns a handle; invalidate(handle) tombstones that entry (e.g. a
+    sold tower that undo must not bring back) without searching the stack.
+    pop() skips tombstones. Tombstones are dropped as they reach the top, or
+    all at once when they outnumber the live entries.
+    """
+    def __init__(self):
+        self.entries = []
+        self.live_count = 0
+
+    def push(self, item):
+        entry = UndoEntry(item)
+        self.entries.append(entry)
+        self.live_count += 1
+        return entry
+
+    def _drop_dead_top(self):
+        while self.entries and not self.entries[-1].live:
+            self.entries.pop()
+
+    def pop(self):
+        self._drop_dead_top()
+        if not self.entries:
+            return None
+        entry = self.entries.pop()
+        entry.live = False
+        self.live_count -= 1
+        return entry.item
+
+    def peek(self):
+        self._drop_dead_top()
+        return self.entries[-1].item if self.entries else None
+
+    def invalidate(self, handle):
+        if handle is None or not handle.live:
+            return False
+        handle.live = False
+        self.live_count -= 1
+
+        dead = len(self.entries) - self.live_count
+        if dead > self.live_count:
+            self.entries = [e for e in self.entries if e.live]
+        return True
+
+    def __len__(self):
+        return self.live_count
+
+    def __iter__(self):
+        """Live items, bottom to top."""
+        for entry in self.entries:
+            if entry.live:
+                yield entry.item
+
+    def clear(self):
+        for entry in self.entries:
+            entry.live = False
+        self.entries.clear()
+        self.live_count = 0
+
+class EntityList:
+    """Live entities (enemies, bullets, towers) with O(1) removal.
+
+    Each entity remembers its position in the backing list
+    (`entity.entity_index`); remove() just leaves a hole there, so removing
+    while iterating is safe and no per-frame copy is needed. Iteration skips
+    holes and keeps insertion order. compact() squeezes the holes out once
+    they outnumber the live entities (amortized O(1) per removal) and must not
+    be called in the middle of an iteration.
+    """
+    def __init__(self):
+        self.items = []
+        self.count = 0
+
+    def append(self, entity):
+        entity.entity_index = len(self.items)
+        self.items.append(entity)
+        self.count += 1
+
+    def __contains__(self, entity):
+        i = getattr(entity, "entity_index", None)
+        return i is not None and i < len(self.items) and self.items[i] is entity
+
+    def remove(self, entity):
+        if entity not in self:
+            raise ValueError("entity not in list")
+        self.items[entity.entity_index] = None
+        entity.entity_index = None
+        self.count -= 1
+
+    def __iter__(self):
+        for entity in self.items:
+            if entity is not None:
+                yield entity
+
+    def __len__(self):
+        return self.count
+
+    def compact(self):
+        holes = len(self.items) - self.count
+        if holes == 0 or holes < self.count:
+            return
+        live = [e for e in self.items if e is not None]
+        for i, entity in enumerate(live):
+            entity.entity_index = i
+        self.items = live
+
+    def clear(self):
+        for entity in self.items:
+            if entity is not None:
+                entity.entity_index = None
+        self.items.clear()
+        self.count = 0
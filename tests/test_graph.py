@@ -0,0 +1,31 @@
+import random
+
+from graph import GridGraph, generate_path, build_path
+from map import TILE_SIZE
+
+# Dead-end spur to a waypoint and back: (1, 4) is a U-turn, not a straight line
+SPUR_TILES = [(0, 5), (1, 5), (1, 4), (1, 5), (2, 5)]
+
+
+def route_length(tiles):
+    # every step goes to a neighbouring tile
+    return (len(tiles) - 1) * TILE_SIZE
+
+
+def test_build_path_keeps_spur_tip():
+    path = build_path(SPUR_TILES, TILE_SIZE)
+    assert path.length == route_length(SPUR_TILES)
+    assert len(path.points) == len(SPUR_TILES)  # both U-turn ends are corners
+
+
+def test_build_path_drops_straight_points():
+    tiles = [(x, 3) for x in range(6)] + [(5, y) for y in range(4, 8)]
+    path = build_path(tiles, TILE_SIZE)
+    assert len(path.points) == 3  # start, the corner, end
+    assert path.length == route_length(tiles)
+
+
+def test_build_path_length_matches_generated_routes():
+    for seed in range(200):
+        tiles = generate_path(GridGraph(), random.Random(seed))
+        assert build_path(tiles, TILE_SIZE).length == route_length(tiles), seed
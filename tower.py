@@ -1,134 +1,135 @@
 import pygame
 import math
 import os
-from bullet import Bullet
+from bullet import create_bullet
+from enemy_index import ProgressIndex, TARGETING_POLICIES
+from assets import assets, RESOURCES_PATH
+
+# -------------------------
+# Tower stats by type (balance runs pass modified copies, see batch.py)
+# -------------------------
+TOWER_STATS = {
+    "Bazooka": {"damage": 10, "range": 100, "cost": 50, "fire_rate": 60},
+    "Sniper": {"damage": 25, "range": 200, "cost": 100, "fire_rate": 90},
+    "Shotgun": {"damage": 5, "range": 80, "cost": 150, "fire_rate": 45},
+}
 
-# Correct path to resources
-RESOURCES_PATH = os.path.join(os.path.dirname(__file__), "resources")
 
 class Tower:
-    sprites = {}          # Class-level storage for scaled sprites
     shoot_sound = None    # Class-level sound (loaded once)
 
-    def __init__(self, tower_type, x, y, tile):
+    def __init__(self, tower_type, x, y, tile, stats=None):
         self.type = tower_type
         self.x = x
         self.y = y
         self.tile = tile
-        self.range = 100
-        self.damage = 10
-        self.fire_rate = 60
-        self.cost = 0
         self.timer = 0
         self.angle = 0
+        self.undo_handle = None   # UndoStack entry while the placement can be undone
+        self.coverage = None      # path distance intervals in range (set by Simulation per path)
+        self.targeting = TARGETING_POLICIES[0]  # which enemy in range to shoot (see enemy_index.py)
 
         # -------------------------
         # Tower stats by type
         # -------------------------
-        if tower_type == "Bazooka":
-            self.damage = 10
-            self.range = 100
-            self.cost = 50
-            self.fire_rate = 60
-        elif tower_type == "Sniper":
-            self.damage = 25
-            self.range = 200
-            self.cost = 100
-            self.fire_rate = 90
-        elif tower_type == "Shotgun":
-            self.damage = 5
-            self.range = 80
-            self.cost = 150
-            self.fire_rate = 45
-        else:
+        base = (stats or TOWER_STATS).get(tower_type)
+        if base is None:
             raise ValueError(f"Unknown tower type: {tower_type}")
+        self.damage = base["damage"]
+        self.range = base["range"]
+        self.cost = base["cost"]
+        self.fire_rate = base["fire_rate"]
 
-        # -------------------------
-        # Load sound ONCE
-        # -------------------------
-        if Tower.shoot_sound is None:
+        # Sprite is shared through the asset cache and fetched on draw
+        self.sprite_name = f"tower_{tower_type}"
+
+    # -------------------------
+    # Load sound ONCE (called by main.py after the mixer is up)
+    # -------------------------
+    @classmethod
+    def load_sound(cls):
+        if cls.shoot_sound is None:
             try:
-                Tower.shoot_sound = pygame.mixer.Sound(
+                cls.shoot_sound = pygame.mixer.Sound(
                     os.path.join(RESOURCES_PATH, "laser.mp3")
                 )
-                Tower.shoot_sound.set_volume(0.4)
+                cls.shoot_sound.set_volume(0.4)
             except pygame.error as e:
                 print(f"Error loading laser sound: {e}")
-                Tower.shoot_sound = None
-
-        # -------------------------
-        # Load and scale sprite ONCE per type
-        # -------------------------
-        if self.type not in Tower.sprites:
-            if self.type == "Bazooka":
-                img_path = os.path.join(RESOURCES_PATH, "BazookaEnergyx2_01.png")
-            elif self.type == "Sniper":
-                img_path = os.path.join(RESOURCES_PATH, "Sniper 01.png")
-            elif self.type == "Shotgun":
-                img_path = os.path.join(RESOURCES_PATH, "Shotgun Idle.png")
-
-            try:
-                raw_image = pygame.image.load(img_path).convert_alpha()
-            except pygame.error as e:
-                print(f"Error loading tower image {img_path}: {e}")
-                raw_image = pygame.Surface((80, 80), pygame.SRCALPHA)
-                raw_image.fill((128, 128, 128))
-
-            # Scale (bigger than tiles, keep aspect ratio)
-            orig_w, orig_h = raw_image.get_size()
-            desired_width = 80
-            scale_factor = desired_width / orig_w
-            new_height = int(orig_h * scale_factor)
-
-            Tower.sprites[self.type] = pygame.transform.smoothscale(
-                raw_image, (desired_width, new_height)
-            )
-
-        self.original_sprite = Tower.sprites[self.type]
+                cls.shoot_sound = None
 
     # -------------------------
     # Shooting logic
     # -------------------------
-    def shoot(self, enemies, bullets):
+    def shoot(self, enemies, bullets, enemy_grid=None):
+        """Tick the reload timer; fire once every `fire_rate` calls.
+        (Simulation schedules fire() through a FireScheduler instead.)"""
         self.timer += 1
         if self.timer < self.fire_rate:
             return
         self.timer = 0
+        self.fire(enemies, bullets, enemy_grid)
+
+    def fire(self, enemies, bullets, enemy_grid=None, index=None):
+        """Fire at an enemy in range now. Returns True if a bullet was fired.
+
+        With `coverage` set, the target is picked by the `targeting` policy
+        from `index` (a ProgressIndex of `enemies`, built here if not given).
+        Otherwise it is the first enemy in range in list order, and with
+        `enemy_grid` (a SpatialHash of `enemies`) only nearby enemies are
+        checked instead of the whole list."""
+        if self.coverage is not None:
+            target = None
+            if self.coverage:
+                if index is None:
+                    index = ProgressIndex(enemies)
+                target = index.target(self.coverage, self.targeting)
+        elif enemy_grid is not None:
+            in_range = enemy_grid.query(self.x, self.y, self.range)
+            target = in_range[0] if in_range else None
+        else:
+            target = None
+            for enemy in enemies:
+                distance = math.hypot(enemy.x - self.x, enemy.y - self.y)
+                if distance <= self.range:
+                    target = enemy
+                    break
 
-        for enemy in enemies:
-            distance = math.hypot(enemy.x - self.x, enemy.y - self.y)
-            if distance <= self.range:
-                dx = enemy.x - self.x
-                dy = enemy.y - self.y
-                self.angle = math.degrees(math.atan2(dy, dx))
+        if target is None:
+            return False
 
-                bullets.append(Bullet(self.x, self.y, enemy, self.damage))
+        dx = target.x - self.x
+        dy = target.y - self.y
+        self.angle = math.degrees(math.atan2(dy, dx))
 
-                # 🔊 Play sound
-                if Tower.shoot_sound:
-                    Tower.shoot_sound.play()
+        bullets.append(create_bullet(self.x, self.y, target, self.damage))
 
-                break
+        # 🔊 Play sound
+        if Tower.shoot_sound:
+            Tower.shoot_sound.play()
+        return True
 
     # -------------------------
     # Draw tower
     # -------------------------
     def draw(self, screen, show_range=False):
-        rotated_sprite = pygame.transform.rotate(
-            self.original_sprite, -self.angle
-        )
+        rotated_sprite = assets.rotated(self.sprite_name, -self.angle)
         rect = rotated_sprite.get_rect(center=(int(self.x), int(self.y)))
-        screen.blit(rotated_sprite, rect)
+        rect = screen.blit(rotated_sprite, rect)
 
         if show_range:
-            pygame.draw.circle(
+            circle_rect = pygame.draw.circle(
                 screen,
                 (255, 255, 255),
                 (int(self.x), int(self.y)),
                 self.range,
                 2
             )
+            rect = rect.union(circle_rect)
+
+        # Area touched on screen (for dirty-rect updates)
+        return rect
 
 
-def create_tower(tower_type, x, y, tile):
-    return Tower(tower_type, x, y, tile)
+def create_tower(tower_type, x, y, tile, stats=None):
+    return Tower(tower_type, x, y, tile, stats)
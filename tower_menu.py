@@ -4,18 +4,22 @@ import math
 class TowerMenu:
     def __init__(self, x, y, tower, refund_ratio=0.60):
         self.tower = tower
+        self.refund_ratio = refund_ratio
         self.refund = math.floor(tower.cost * refund_ratio)
 
         self.w = 210
-        self.h = 75
+        self.h = 105
 
         self.rect = pygame.Rect(x, y, self.w, self.h)
         self.btn_range = pygame.Rect(x + 10, y + 10, self.w - 20, 25)
-        self.btn_sell  = pygame.Rect(x + 10, y + 40, self.w - 20, 25)
+        self.btn_target = pygame.Rect(x + 10, y + 40, self.w - 20, 25)
+        self.btn_sell  = pygame.Rect(x + 10, y + 70, self.w - 20, 25)
 
     def handle_click(self, pos):
         if self.btn_range.collidepoint(pos):
             return "toggle_range"
+        if self.btn_target.collidepoint(pos):
+            return "targeting"
         if self.btn_sell.collidepoint(pos):
             return "sell"
         if self.rect.collidepoint(pos):
@@ -31,6 +35,13 @@ class TowerMenu:
         screen.blit(font.render(label, True, (255, 255, 255)),
                     (self.btn_range.x + 8, self.btn_range.y + 4))
 
+        pygame.draw.rect(screen, (80, 110, 80), self.btn_target)
+        screen.blit(font.render(f"Target: {self.tower.targeting.title()}", True, (255, 255, 255)),
+                    (self.btn_target.x + 8, self.btn_target.y + 4))
+
         pygame.draw.rect(screen, (120, 60, 60), self.btn_sell)
         screen.blit(font.render(f"Remove (+${self.refund})", True, (255, 255, 255)),
                     (self.btn_sell.x + 8, self.btn_sell.y + 4))
+
+        # Area touched on screen (for dirty-rect updates)
+        return self.rect